@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for RabbitMQHandler.emit with a null transport.
+
+Measures records per second through the handler (parsing, payload building and
+hand-over) without touching the network.
+
+Usage:
+    python benchmarks/bench_rabbitmq_handler.py [records]
+"""
+from chassis.logging import RabbitMQHandler
+from chassis.logging.types import LogPayload
+from chassis.messaging import RabbitMQConfig
+import logging
+import sys
+import time
+
+class NullTransport:
+    """Transport that accepts every payload and discards it."""
+    def __init__(self) -> None:
+        self.sent = 0
+
+    def send(self, routing_key: str, payload: LogPayload) -> bool:
+        self.sent += 1
+        return True
+
+    def close(self) -> None:
+        pass
+
+CONFIG: RabbitMQConfig = {
+    "host": "localhost",
+    "port": 5672,
+    "username": "guest",
+    "password": "guest",
+    "use_tls": False,
+    "ca_cert": None,
+    "client_cert": None,
+    "client_key": None,
+    "prefetch_count": 1,
+}
+
+CASES = {
+    "tagged": ("[LOG:CHASSIS:BENCH] - Processed order: order_id=%s", (123,)),
+    "tagged_inner_brackets": ("[EVENT:PIECE:CREATED] - Piece [%s] created", (456,)),
+    "untagged": ("Processed order: order_id=%s", (123,)),
+}
+
+def run_case(msg: str, args: tuple, records: int) -> float:
+    transport = NullTransport()
+    handler = RabbitMQHandler(CONFIG, transport=transport)
+    record = logging.LogRecord("bench", logging.INFO, __file__, 1, msg, args, None)
+
+    start = time.perf_counter()
+    for _ in range(records):
+        handler.emit(record)
+    elapsed = time.perf_counter() - start
+    return records / elapsed
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for name, (msg, args) in CASES.items():
+        rate = run_case(msg, args, records)
+        print(f"{name:<24} {rate:>12,.0f} records/s")
+
+if __name__ == "__main__":
+    main()
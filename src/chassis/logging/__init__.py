@@ -2,10 +2,28 @@ from .rabbitmq_handler import (
     get_logger,
     RabbitMQHandler,
     setup_rabbitmq_logging,
+    shutdown_rabbitmq_logging,
+)
+from .sampling import LogSampler
+from .transport import QueuedLogTransport
+from .types import (
+    LogBatchConfig,
+    LogSamplingConfig,
+    LogTransport,
+    LogTransportConfig,
+    OverflowPolicy,
 )
 
 __all__: list[str] = [
     "get_logger",
+    "LogBatchConfig",
+    "LogSampler",
+    "LogSamplingConfig",
+    "LogTransport",
+    "LogTransportConfig",
+    "OverflowPolicy",
+    "QueuedLogTransport",
     "RabbitMQHandler",
     "setup_rabbitmq_logging",
+    "shutdown_rabbitmq_logging",
 ]
\ No newline at end of file
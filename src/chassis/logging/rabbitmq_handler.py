@@ -1,52 +1,122 @@
 from ..messaging import (
     RabbitMQConfig,
+    RabbitMQConnectionPool,
     RabbitMQPublisher
 )
+from .sampling import (
+    LogSampler,
+    SamplingKey,
+)
+from .transport import QueuedLogTransport
+from .types import (
+    LogPayload,
+    LogSamplingConfig,
+    LogTransport,
+    LogTransportConfig,
+)
 from datetime import (
     datetime,
     timezone,
 )
+from functools import lru_cache
 from typing import (
     Dict, 
     Any, 
+    List,
     Optional, 
     Set, 
+    Tuple,
 )
+import atexit
 import logging
 import re
+import threading
+
+_TAG_PATTERN = re.compile(r'\[([A-Z]+):([^\]]+)\]')
+_LEADING_TAG_PATTERN = re.compile(r'\[([A-Z]+):([^\]\n]+)\]\s*-?\s*')
+_METADATA_PATTERN = re.compile(r'\[.*?\]\s*-?\s*')
+# Record attribute holding (sampler, decision), so a record reaching several
+# handlers (e.g. a named logger's and the root's) is sampled once
+_SAMPLING_ATTR = "_chassis_sampling"
+
+@lru_cache(maxsize=64)
+def _routing_key_for(log_type: str) -> str:
+    return f"log.{log_type.lower()}"
+
+def _parse_tagged_message(
+    msg: str, 
+    type_pattern: re.Pattern[str] = _TAG_PATTERN,
+) -> Optional[Tuple[str, str, str]]:
+    """Return (log_type, subtype, cleaned message), or None if msg has no type tag."""
+    # Fast path: a single leading tag, e.g. "[LOG:CHASSIS:CONSUL] - Registered"
+    match = _LEADING_TAG_PATTERN.match(msg)
+    if match is not None and msg.find("[", match.end()) == -1:
+        log_type, subtype = match.groups()
+        return log_type, subtype, msg[match.end():]
+
+    # Tag elsewhere or several bracket groups: remove every one of them
+    match = type_pattern.search(msg)
+    if match is None:
+        return None
+    log_type, subtype = match.groups()
+    return log_type, subtype, _METADATA_PATTERN.sub('', msg)
 
 class RabbitMQHandler(logging.Handler):
-    """Handler that publishes logs to RabbitMQ based on type."""
+    """
+    Handler that publishes logs to RabbitMQ based on type.
+    Without a transport, records are published synchronously, over the
+    calling thread's pooled connection when a pool is given.
+    A transport is closed with the handler only if owns_transport is set;
+    a shared transport (see RabbitMQLoggerManager) outlives its handlers.
+    """
     
     def __init__(
         self, 
         rabbitmq_config: RabbitMQConfig, 
-        exchange: str = "logs"
+        exchange: str = "logs",
+        transport: Optional[LogTransport] = None,
+        sampler: Optional[LogSampler] = None,
+        pool: Optional[RabbitMQConnectionPool] = None,
+        owns_transport: bool = False,
     ) -> None:
         super().__init__()
         self.rabbitmq_config = rabbitmq_config
         self.exchange = exchange
-        self.type_pattern = re.compile(r'\[([A-Z]+):([^\]]+)\]')
+        self.transport = transport
+        self.owns_transport = owns_transport
+        self.sampler = sampler
+        self.pool = pool
+        self.type_pattern = _TAG_PATTERN
     
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            # Parse log type and subtype from message
-            match = self.type_pattern.search(record.getMessage())
-            if not match:
+            # Untagged records are rejected before any formatting
+            if isinstance(record.msg, str) and "[" not in record.msg:
                 return
-            
-            log_type, subtype = match.groups()
-            msg = record.getMessage()
 
-            # Clean message (remove type tag and metadata)
-            message = re.sub(r'\[.*?\]\s*-?\s*', '', msg)
+            # Parse log type, subtype and clean message in one pass
+            parsed = _parse_tagged_message(record.getMessage(), self.type_pattern)
+            if parsed is None:
+                return
+            log_type, subtype, message = parsed
+
+            # Rate limiting and sampling, with periodic suppression summaries
+            if self.sampler is not None:
+                for key, count in self.sampler.due_summaries():
+                    self._ship_summary(key, count)
+                decision = getattr(record, _SAMPLING_ATTR, None)
+                if decision is None or decision[0] is not self.sampler:
+                    decision = (self.sampler, self.sampler.allow((log_type, subtype, record.levelname)))
+                    setattr(record, _SAMPLING_ATTR, decision)
+                if not decision[1]:
+                    return
             
             log_data: Dict[str, Any] = {
                 "log_type": log_type,
                 "subtype": subtype,
                 "level": record.levelname,
                 "message": message,
-                "timestamp": str(datetime.now(timezone.utc)),
+                "timestamp": str(datetime.fromtimestamp(record.created, timezone.utc)),
                 "source": {
                     "filename": record.filename,
                     "lineno": record.lineno,
@@ -56,42 +126,140 @@ class RabbitMQHandler(logging.Handler):
                 }
             }
             
-            routing_key = f"log.{log_type.lower()}"
-            
-            with RabbitMQPublisher(
-                queue="",
-                rabbitmq_config=self.rabbitmq_config,
-                exchange=self.exchange,
-                exchange_type="topic",
-                routing_key=routing_key,
-                auto_delete_queue=True,
-            ) as publisher:
-                publisher.publish(log_data)
+            self._ship(_routing_key_for(log_type), log_data)
                 
         except Exception as e:
             self.handleError(record)
 
+    def close(self) -> None:
+        if self.sampler is not None:
+            for key, count in self.sampler.drain_summaries():
+                try:
+                    self._ship_summary(key, count)
+                except Exception:
+                    pass
+        if self.transport is not None and self.owns_transport:
+            self.transport.close()
+        super().close()
+
+    def _ship(self, routing_key: str, log_data: LogPayload) -> None:
+        # Non-blocking mode: hand over to the background transport
+        if self.transport is not None:
+            self.transport.send(routing_key, log_data)
+            return
+
+        with RabbitMQPublisher(
+            queue="",
+            rabbitmq_config=self.rabbitmq_config,
+            exchange=self.exchange,
+            exchange_type="topic",
+            routing_key=routing_key,
+            auto_delete_queue=True,
+            pool=self.pool,
+        ) as publisher:
+            publisher.publish(log_data)
+
+    def _ship_summary(self, key: SamplingKey, count: int) -> None:
+        log_type, subtype, level = key
+        log_data: Dict[str, Any] = {
+            "log_type": log_type,
+            "subtype": subtype,
+            "level": level,
+            "message": f"{count} similar records suppressed",
+            "timestamp": str(datetime.now(timezone.utc)),
+            "suppressed": count,
+            "source": {
+                "filename": None,
+                "lineno": None,
+                "funcName": None,
+                "pathname": None,
+                "logger": __name__,
+            }
+        }
+        self._ship(_routing_key_for(log_type), log_data)
+
 class RabbitMQLoggerManager:  
     def __init__(
         self, 
         rabbitmq_config: RabbitMQConfig, 
-        exchange: str = "logs"
+        exchange: str = "logs",
+        transport_config: Optional[LogTransportConfig] = None,
+        sampling_config: Optional[LogSamplingConfig] = None,
     ) -> None:
         self.rabbitmq_config = rabbitmq_config
         self.exchange = exchange
         self._handler_added_to: Set[str] = set()
+        self._handlers: List[Tuple[logging.Logger, RabbitMQHandler]] = []
+        
+        # One shared background transport for every handler, closed by close()
+        self.transport: Optional[QueuedLogTransport] = None
+        if transport_config is not None:
+            self.transport = QueuedLogTransport(
+                rabbitmq_config=rabbitmq_config,
+                exchange=exchange,
+                **transport_config,
+            )
+
+        # One shared sampler so limits apply per key across all handlers
+        self.sampler: Optional[LogSampler] = None
+        self._stopping = threading.Event()
+        self._summary_thread: Optional[threading.Thread] = None
+        if sampling_config is not None:
+            self.sampler = LogSampler(**sampling_config)
+            # Summaries are due even when the suppressed keys went quiet
+            self._summary_thread = threading.Thread(
+                target=self._run_summaries,
+                name="chassis-log-summaries",
+                daemon=True,
+            )
+            self._summary_thread.start()
     
     def get_logger(self, name: str) -> logging.Logger:
         logger = logging.getLogger(name)
         
         if name not in self._handler_added_to:
-            rabbitmq_handler = RabbitMQHandler(self.rabbitmq_config, self.exchange)
+            rabbitmq_handler = RabbitMQHandler(
+                self.rabbitmq_config, 
+                self.exchange,
+                transport=self.transport,
+                sampler=self.sampler,
+            )
             rabbitmq_handler.setLevel(logging.INFO)
             logger.addHandler(rabbitmq_handler)
             self._handler_added_to.add(name)
+            self._handlers.append((logger, rabbitmq_handler))
         
         return logger
 
+    def close(self) -> None:
+        """Detach and close every handler, then drain and close the shared transport."""
+        self._stopping.set()
+        if self._summary_thread is not None:
+            self._summary_thread.join()
+        for logger, rabbitmq_handler in self._handlers:
+            logger.removeHandler(rabbitmq_handler)
+            # Ships pending suppression summaries through the transport
+            rabbitmq_handler.close()
+        self._handlers.clear()
+        self._handler_added_to.clear()
+        if self.transport is not None:
+            self.transport.close()
+
+    def _run_summaries(self) -> None:
+        """Ship the suppression summaries every summary interval."""
+        assert self.sampler is not None, "A sampler is required to ship summaries"
+        shipper = RabbitMQHandler(
+            self.rabbitmq_config,
+            self.exchange,
+            transport=self.transport,
+        )
+        while not self._stopping.wait(self.sampler.summary_due_in):
+            for key, count in self.sampler.due_summaries():
+                try:
+                    shipper._ship_summary(key, count)
+                except Exception:
+                    pass
+
 # Global instance - initialize once at startup
 _manager: Optional[RabbitMQLoggerManager] = None
 
@@ -99,9 +267,30 @@ def setup_rabbitmq_logging(
     rabbitmq_config: RabbitMQConfig, 
     exchange: str = "logs",
     capture_dependencies: bool = False,
+    transport_config: Optional[LogTransportConfig] = None,
+    sampling_config: Optional[LogSamplingConfig] = None,
 ) -> None:
+    """
+    Configure RabbitMQ logging once at startup.
+
+    Passing transport_config enables the non-blocking mode: records are queued
+    and published by a background thread over one long-lived connection.
+    Passing sampling_config rate limits and samples records per
+    (log_type, subtype, level), shipping periodic suppression summaries.
+    Calling it again replaces (and closes) the previous configuration.
+    """
     global _manager
-    _manager = RabbitMQLoggerManager(rabbitmq_config, exchange)
+    if _manager is None:
+        # Runs before logging.shutdown (atexit is LIFO), so queued records are still shipped
+        atexit.register(shutdown_rabbitmq_logging)
+    else:
+        _manager.close()
+    _manager = RabbitMQLoggerManager(
+        rabbitmq_config, 
+        exchange, 
+        transport_config,
+        sampling_config,
+    )
     
     if capture_dependencies:
         _manager.get_logger("")
@@ -115,6 +304,13 @@ def get_logger(name: str) -> logging.Logger:
         )
     return _manager.get_logger(name)
 
+def shutdown_rabbitmq_logging() -> None:
+    """Detach the RabbitMQ handlers and flush the background transport."""
+    global _manager
+    if _manager is not None:
+        _manager.close()
+        _manager = None
+
 
 # # Usage example with logging.ini
 # if __name__ == '__main__':
@@ -0,0 +1,114 @@
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import random
+import threading
+import time
+
+type SamplingKey = Tuple[str, str, str]
+
+class TokenBucket:
+    """Classic token bucket: refills at rate tokens/s up to burst tokens."""
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def consume(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class LogSampler:
+    """
+    Rate limiting and probabilistic sampling per (log_type, subtype, level).
+
+    Records are first sampled (sample_rate, or the per-level override) and then
+    checked against a token bucket of rate_limit records/s with burst capacity.
+    Suppressed records are counted per key and reported back as
+    "N similar records suppressed" summaries every summary_interval seconds.
+    """
+
+    def __init__(
+        self,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None,
+        sample_rate: float = 1.0,
+        level_sample_rates: Optional[Dict[str, float]] = None,
+        summary_interval: float = 60.0,
+    ) -> None:
+        self._rate_limit = rate_limit
+        self._burst = burst if burst is not None else max(1.0, rate_limit or 1.0)
+        self._sample_rate = sample_rate
+        self._level_sample_rates = level_sample_rates or {}
+        self._summary_interval = summary_interval
+        self._buckets: Dict[SamplingKey, TokenBucket] = {}
+        self._suppressed: Dict[SamplingKey, int] = {}
+        self._next_summary_at = time.monotonic() + summary_interval
+        self._lock = threading.Lock()
+
+        # Counters
+        self._allowed = 0
+        self._suppressed_total = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the sampler counters."""
+        return {
+            "allowed": self._allowed,
+            "suppressed": self._suppressed_total,
+            "pending_summaries": len(self._suppressed),
+        }
+
+    @property
+    def summary_due_in(self) -> float:
+        """Seconds until due_summaries() returns the pending counts."""
+        return max(0.0, self._next_summary_at - time.monotonic())
+
+    def allow(self, key: SamplingKey) -> bool:
+        """Return True if a record with this key should be shipped."""
+        sample_rate = self._level_sample_rates.get(key[2], self._sample_rate)
+        with self._lock:
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return self._suppress(key)
+            if self._rate_limit is not None:
+                now = time.monotonic()
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(self._rate_limit, self._burst, now)
+                if not bucket.consume(now):
+                    return self._suppress(key)
+            self._allowed += 1
+            return True
+
+    def due_summaries(self) -> List[Tuple[SamplingKey, int]]:
+        """Return and reset suppression counts once the summary interval elapsed."""
+        if time.monotonic() < self._next_summary_at:
+            return []
+        with self._lock:
+            self._next_summary_at = time.monotonic() + self._summary_interval
+            return self._take_summaries()
+
+    def drain_summaries(self) -> List[Tuple[SamplingKey, int]]:
+        """Return and reset every pending suppression count."""
+        with self._lock:
+            return self._take_summaries()
+
+    def _suppress(self, key: SamplingKey) -> bool:
+        self._suppressed[key] = self._suppressed.get(key, 0) + 1
+        self._suppressed_total += 1
+        return False
+
+    def _take_summaries(self) -> List[Tuple[SamplingKey, int]]:
+        summaries = list(self._suppressed.items())
+        self._suppressed.clear()
+        return summaries
@@ -0,0 +1,257 @@
+from ..messaging import (
+    RabbitMQConfig,
+    RabbitMQPublisher,
+)
+from .types import (
+    LogBatchConfig,
+    LogPayload,
+    OverflowPolicy,
+)
+from queue import (
+    Empty,
+    Full,
+    Queue,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import threading
+import time
+
+class QueuedLogTransport:
+    """
+    Ships log payloads to RabbitMQ from a single background thread.
+
+    Records are put in a bounded in-memory queue and published over one
+    long-lived connection, so the logging caller never waits on the network.
+    When the queue is full the overflow policy decides what happens:
+        - "block": wait up to block_timeout for room, then drop the record.
+        - "drop_oldest": discard the oldest queued record to make room.
+        - "drop_newest": discard the incoming record.
+
+    With a batch_config, records are grouped by routing key and each group is
+    published as one message holding a JSON array once it reaches max_records,
+    roughly max_bytes of log text, or has waited max_linger seconds.
+    """
+    _THREAD_NAME: str = "chassis-log-transport"
+    _IDLE_POLL_INTERVAL: float = 0.5
+    # Rough per-record size of the payload fields besides the message text
+    _RECORD_OVERHEAD_BYTES: int = 256
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        exchange: str = "logs",
+        max_queue_size: int = 10000,
+        overflow_policy: OverflowPolicy = "drop_newest",
+        block_timeout: Optional[float] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        batch_config: Optional[LogBatchConfig] = None,
+    ) -> None:
+        if overflow_policy not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self._rabbitmq_config = rabbitmq_config
+        self._exchange = exchange
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._min_reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._reconnect_delay = reconnect_delay
+        self._queue: Queue[Optional[Tuple[str, LogPayload]]] = Queue(maxsize=max_queue_size)
+        self._publisher: Optional[RabbitMQPublisher] = None
+        self._stopping = threading.Event()
+        self._counter_lock = threading.Lock()
+        self._closed = False
+
+        # Batching state, keyed by routing key
+        self._batching = batch_config is not None
+        batch_config = batch_config or {}
+        self._batch_max_records = batch_config.get("max_records", 500)
+        self._batch_max_bytes = batch_config.get("max_bytes", 256 * 1024)
+        self._batch_max_linger = batch_config.get("max_linger", 1.0)
+        self._batches: Dict[str, List[LogPayload]] = {}
+        self._batch_bytes: Dict[str, int] = {}
+        self._batch_deadlines: Dict[str, float] = {}
+
+        # Counters
+        self._published = 0
+        self._messages = 0
+        self._failed = 0
+        self._dropped_oldest = 0
+        self._dropped_newest = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self._THREAD_NAME,
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the transport counters."""
+        return {
+            "queued": self._queue.qsize(),
+            "published": self._published,
+            "messages": self._messages,
+            "failed": self._failed,
+            "dropped_oldest": self._dropped_oldest,
+            "dropped_newest": self._dropped_newest,
+            "dropped": self._dropped_oldest + self._dropped_newest,
+        }
+
+    def send(self, routing_key: str, payload: LogPayload) -> bool:
+        """Queue a payload for publishing. Returns False if it was dropped."""
+        if self._closed:
+            self._count_dropped_newest()
+            return False
+
+        item = (routing_key, payload)
+        if self._overflow_policy == "block":
+            try:
+                self._queue.put(item, timeout=self._block_timeout)
+            except Full:
+                self._count_dropped_newest()
+                return False
+        elif self._overflow_policy == "drop_oldest":
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except Full:
+                    try:
+                        self._queue.get_nowait()
+                        with self._counter_lock:
+                            self._dropped_oldest += 1
+                    except Empty:
+                        pass
+        else:
+            try:
+                self._queue.put_nowait(item)
+            except Full:
+                self._count_dropped_newest()
+                return False
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop accepting records, drain the queue and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(None)
+        except Full:
+            pass
+        self._thread.join(timeout)
+
+    def _count_dropped_newest(self) -> None:
+        with self._counter_lock:
+            self._dropped_newest += 1
+
+    def _run(self) -> None:
+        """Background loop draining the queue."""
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._next_poll_timeout())
+                except Empty:
+                    self._flush_expired_batches()
+                    if self._stopping.is_set():
+                        break
+                    continue
+                if item is None:
+                    if self._queue.empty():
+                        break
+                    continue
+                if self._batching:
+                    self._add_to_batch(*item)
+                    self._flush_expired_batches()
+                else:
+                    self._deliver(item[0], [item[1]])
+        finally:
+            for routing_key in list(self._batches):
+                self._flush_batch(routing_key)
+            self._disconnect()
+
+    def _next_poll_timeout(self) -> float:
+        if not self._batch_deadlines:
+            return self._IDLE_POLL_INTERVAL
+        remaining = min(self._batch_deadlines.values()) - time.monotonic()
+        return max(0.0, min(remaining, self._IDLE_POLL_INTERVAL))
+
+    def _add_to_batch(self, routing_key: str, payload: LogPayload) -> None:
+        batch = self._batches.get(routing_key)
+        if batch is None:
+            batch = self._batches[routing_key] = []
+            self._batch_bytes[routing_key] = 0
+            self._batch_deadlines[routing_key] = time.monotonic() + self._batch_max_linger
+        batch.append(payload)
+        self._batch_bytes[routing_key] += len(str(payload.get("message", ""))) + self._RECORD_OVERHEAD_BYTES
+        if (
+            len(batch) >= self._batch_max_records
+            or self._batch_bytes[routing_key] >= self._batch_max_bytes
+        ):
+            self._flush_batch(routing_key)
+
+    def _flush_expired_batches(self) -> None:
+        now = time.monotonic()
+        for routing_key, deadline in list(self._batch_deadlines.items()):
+            if deadline <= now:
+                self._flush_batch(routing_key)
+
+    def _flush_batch(self, routing_key: str) -> None:
+        batch = self._batches.pop(routing_key)
+        del self._batch_bytes[routing_key]
+        del self._batch_deadlines[routing_key]
+        self._deliver(routing_key, batch)
+
+    def _deliver(self, routing_key: str, payloads: List[LogPayload]) -> None:
+        # One retry on a fresh connection before giving up on the records
+        for _ in range(2):
+            try:
+                publisher = self._ensure_publisher(routing_key)
+                if self._batching:
+                    publisher.publish_batch(payloads, routing_key=routing_key)
+                else:
+                    publisher.publish(payloads[0], routing_key=routing_key)
+                self._published += len(payloads)
+                self._messages += 1
+                return
+            except Exception:
+                self._disconnect()
+                self._backoff()
+        self._failed += len(payloads)
+
+    def _ensure_publisher(self, routing_key: str) -> RabbitMQPublisher:
+        if self._publisher is None:
+            publisher = RabbitMQPublisher(
+                queue="",
+                rabbitmq_config=self._rabbitmq_config,
+                exchange=self._exchange,
+                exchange_type="topic",
+                routing_key=routing_key,
+                auto_delete_queue=True,
+            )
+            publisher._connect()
+            self._publisher = publisher
+            self._reconnect_delay = self._min_reconnect_delay
+        return self._publisher
+
+    def _disconnect(self) -> None:
+        if self._publisher is not None:
+            try:
+                self._publisher._close()
+            except Exception:
+                pass
+            self._publisher = None
+
+    def _backoff(self) -> None:
+        """Wait before reconnecting; interrupted as soon as close() is called."""
+        if self._stopping.wait(self._reconnect_delay):
+            return
+        self._reconnect_delay = min(self._reconnect_delay * 2, self._max_reconnect_delay)
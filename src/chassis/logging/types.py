@@ -0,0 +1,35 @@
+from typing import (
+    Any,
+    Dict,
+    Literal,
+    Optional,
+    Protocol,
+    TypedDict,
+)
+
+type LogPayload = Dict[str, Any]
+type OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+class LogTransport(Protocol):
+    def send(self, routing_key: str, payload: LogPayload) -> bool: ...
+    def close(self) -> None: ...
+
+class LogBatchConfig(TypedDict, total=False):
+    max_records: int
+    max_bytes: int
+    max_linger: float
+
+class LogTransportConfig(TypedDict, total=False):
+    max_queue_size: int
+    overflow_policy: OverflowPolicy
+    block_timeout: Optional[float]
+    reconnect_delay: float
+    max_reconnect_delay: float
+    batch_config: Optional[LogBatchConfig]
+
+class LogSamplingConfig(TypedDict, total=False):
+    rate_limit: Optional[float]
+    burst: Optional[float]
+    sample_rate: float
+    level_sample_rates: Optional[Dict[str, float]]
+    summary_interval: float
@@ -1,12 +1,55 @@
+from .async_listener import (
+    AsyncDelivery,
+    AsyncRabbitMQListener,
+)
+from .async_publisher import AsyncRabbitMQPublisher
+from .compression import (
+    Compressor,
+    register_compressor,
+)
+from .dedupe import (
+    DeduplicationStore,
+    MessageDeduplicator,
+)
+from .health import (
+    get_health_monitor,
+    RabbitMQHealthMonitor,
+)
 from .listener import RabbitMQListener
+from .loop_runner import AsyncLoopRunner
+from .metrics import (
+    get_metrics,
+    MessagingMetrics,
+)
+from .pool import (
+    get_connection_pool,
+    RabbitMQConnectionPool,
+)
 from .publisher import RabbitMQPublisher
+from .retry import RetryTopology
+from .routing import RoutingTrie
+from .serializers import (
+    get_serializer,
+    register_serializer,
+    Serializer,
+    use_orjson,
+)
+from .spool import PublishSpool
+from .supervisor import ConsumerSupervisor
+from .topology import clear_topology_cache
 from .types import (
+    DeclareMode,
     MessageType,
+    PublishManyResult,
     RabbitMQConfig,
+    RabbitMQHealthStatus,
+    RetryPolicy,
 )
 from .utils import (
     is_rabbitmq_healthy,
     register_queue_handler,
+    start_all_listeners,
+    start_async_rabbitmq_listener,
     start_rabbitmq_listener,
 )
 from typing import (
@@ -15,11 +58,40 @@ from typing import (
 )
 
 __all__: List[LiteralString] = [
+    "AsyncDelivery",
+    "AsyncLoopRunner",
+    "AsyncRabbitMQListener",
+    "AsyncRabbitMQPublisher",
+    "clear_topology_cache",
+    "Compressor",
+    "ConsumerSupervisor",
+    "DeclareMode",
+    "DeduplicationStore",
+    "get_connection_pool",
+    "get_health_monitor",
+    "get_metrics",
+    "get_serializer",
     "is_rabbitmq_healthy",
+    "MessageDeduplicator",
     "MessageType",
+    "MessagingMetrics",
+    "PublishManyResult",
+    "PublishSpool",
     "RabbitMQConfig",
+    "RabbitMQConnectionPool",
+    "RabbitMQHealthMonitor",
+    "RabbitMQHealthStatus",
     "RabbitMQListener",
     "RabbitMQPublisher",
+    "register_compressor",
     "register_queue_handler",
+    "register_serializer",
+    "RetryPolicy",
+    "RetryTopology",
+    "RoutingTrie",
+    "Serializer",
+    "start_all_listeners",
+    "start_async_rabbitmq_listener",
     "start_rabbitmq_listener",
+    "use_orjson",
 ]
\ No newline at end of file
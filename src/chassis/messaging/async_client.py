@@ -0,0 +1,209 @@
+from .client import (
+    build_connection_parameters,
+    RabbitMQBaseClient,
+)
+from .topology import (
+    broker_key,
+    is_declared,
+    mark_declared,
+    TopologyItem,
+)
+from .types import (
+    DeclareMode,
+    RabbitMQConfig,
+)
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.channel import Channel
+from pika.exceptions import (
+    AMQPConnectionError,
+    ChannelClosed,
+)
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+    Set,
+    Type,
+)
+import asyncio
+
+class AsyncRabbitMQBaseClient:
+    """Base client running on the caller's asyncio loop (pika asyncio adapter)."""
+    _CONTENT_TYPE = RabbitMQBaseClient._CONTENT_TYPE
+    _BATCH_HEADER = RabbitMQBaseClient._BATCH_HEADER
+    _DEFAULT_EXCHANGE = RabbitMQBaseClient._DEFAULT_EXCHANGE
+    _APPLY_QOS = RabbitMQBaseClient._APPLY_QOS
+    _DECLARE_UNNAMED_QUEUE = RabbitMQBaseClient._DECLARE_UNNAMED_QUEUE
+
+    def __init__(
+        self,
+        queue: str,
+        rabbitmq_config: RabbitMQConfig,
+        exchange: Optional[str] = None,
+        exchange_type: str = "direct",
+        routing_key: Optional[str] = None,
+        auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        binding_keys: Optional[List[str]] = None,
+    ) -> None:
+        if declare_mode not in ("once", "always", "passive", "none"):
+            raise ValueError(f"Unknown declare mode: {declare_mode}")
+        self._queue = queue
+        self._prefetch_count = rabbitmq_config["prefetch_count"]
+        self._exchange = exchange if exchange is not None else self._DEFAULT_EXCHANGE
+        self._exchange_type = exchange_type
+        self._routing_key = routing_key if routing_key is not None else queue
+        # Keys (or topic patterns) the queue is bound with; defaults to the routing key
+        self._binding_keys = binding_keys if binding_keys else [self._routing_key]
+        self._auto_delete = auto_delete_queue
+        self._declare_mode = declare_mode
+        self._params = build_connection_parameters(rabbitmq_config)
+        self._broker = broker_key(self._params)
+        self._connection: Optional[AsyncioConnection] = None
+        self._channel: Optional[Channel] = None
+        self._closed_future: Optional[asyncio.Future[None]] = None
+        self._pending: Set[asyncio.Future[Any]] = set()
+        self._connect_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self._connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Optional[bool]:
+        """Async context manager exit."""
+        await self._close()
+        return None
+
+    @property
+    def is_connected(self) -> bool:
+        return (
+            self._connection is not None
+            and self._connection.is_open
+            and self._channel is not None
+            and self._channel.is_open
+        )
+
+    async def _connect(self) -> None:
+        """Open connection and channel, then declare the topology."""
+        loop = asyncio.get_running_loop()
+        opened: asyncio.Future[AsyncioConnection] = loop.create_future()
+        self._closed_future = loop.create_future()
+
+        def _on_open_error(connection: AsyncioConnection, error: BaseException) -> None:
+            if not opened.done():
+                opened.set_exception(AMQPConnectionError(error))
+            self._on_connection_closed(connection, error)
+
+        self._connection = AsyncioConnection(
+            parameters=self._params,
+            on_open_callback=lambda connection: opened.done() or opened.set_result(connection),
+            on_open_error_callback=_on_open_error,
+            on_close_callback=self._on_connection_closed,
+            custom_ioloop=loop,
+        )
+        connection = await opened
+
+        channel: Channel = await self._rpc(lambda cb: connection.channel(on_open_callback=cb))
+        channel.add_on_close_callback(self._on_channel_closed)
+        await self._on_channel_open(channel)
+        self._channel = channel
+
+    async def _ensure_connected(self) -> None:
+        """Connect (or reconnect) once, even with many concurrent callers."""
+        if self.is_connected:
+            return
+        async with self._connect_lock:
+            if self.is_connected:
+                return
+            if self._connection is not None and not self._connection.is_closed:
+                await self._close()
+            try:
+                await self._connect()
+            except Exception as e:
+                raise RuntimeError(f"Failed to reconnect to RabbitMQ: {e}")
+
+    async def _on_channel_open(self, channel: Channel) -> None:
+        """Declare QoS, queue, exchange and binding (per declare mode, as in RabbitMQBaseClient)."""
+        if self._APPLY_QOS:
+            await self._rpc(lambda cb: channel.basic_qos(prefetch_count=self._prefetch_count, callback=cb))
+        if self._declare_mode == "none":
+            return
+        passive = self._declare_mode == "passive"
+        has_queue = bool(self._queue) or self._DECLARE_UNNAMED_QUEUE
+        cache_queue = bool(self._queue) and not self._auto_delete
+
+        queue_item = ("queue", self._queue)
+        if has_queue and self._should_declare(queue_item, cache_queue):
+            await self._rpc(lambda cb: channel.queue_declare(
+                queue=self._queue,
+                durable=True,
+                auto_delete=self._auto_delete,
+                passive=passive,
+                callback=cb,
+            ))
+            self._mark_declared(queue_item, cache_queue)
+        if self._exchange != self._DEFAULT_EXCHANGE:
+            exchange_item = ("exchange", self._exchange)
+            if self._should_declare(exchange_item, True):
+                await self._rpc(lambda cb: channel.exchange_declare(
+                    exchange=self._exchange,
+                    exchange_type=self._exchange_type,
+                    durable=True,
+                    passive=passive,
+                    callback=cb,
+                ))
+                self._mark_declared(exchange_item, True)
+            for binding_key in self._binding_keys:
+                binding_item = ("binding", self._queue, self._exchange, binding_key)
+                if has_queue and not passive and self._should_declare(binding_item, cache_queue):
+                    await self._rpc(lambda cb: channel.queue_bind(
+                        queue=self._queue,
+                        exchange=self._exchange,
+                        routing_key=binding_key,
+                        callback=cb,
+                    ))
+                    self._mark_declared(binding_item, cache_queue)
+
+    def _should_declare(self, item: TopologyItem, cacheable: bool) -> bool:
+        return self._declare_mode == "always" or not cacheable or not is_declared(self._broker, item)
+
+    def _mark_declared(self, item: TopologyItem, cacheable: bool) -> None:
+        if cacheable:
+            mark_declared(self._broker, item)
+
+    async def _close(self) -> None:
+        """Close connection and wait until the broker confirms it."""
+        if self._connection is not None and not (self._connection.is_closed or self._connection.is_closing):
+            self._connection.close()
+        if self._closed_future is not None:
+            await self._closed_future
+
+    async def _rpc(self, call: Callable[[Callable[[Any], None]], Any]) -> Any:
+        """Run a callback-style pika call and await its completion callback."""
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        call(lambda result: future.done() or future.set_result(result))
+        return await future
+
+    def _fail_pending(self, error: BaseException) -> None:
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(error)
+
+    def _on_channel_closed(self, channel: Channel, reason: BaseException) -> None:
+        self._fail_pending(reason if isinstance(reason, ChannelClosed) else ChannelClosed(0, str(reason)))
+
+    def _on_connection_closed(self, connection: AsyncioConnection, reason: BaseException) -> None:
+        self._channel = None
+        self._fail_pending(AMQPConnectionError(reason))
+        if self._closed_future is not None and not self._closed_future.done():
+            self._closed_future.set_result(None)
@@ -0,0 +1,223 @@
+from .async_client import AsyncRabbitMQBaseClient
+from .listener import RabbitMQListener
+from .retry import RetryTopology
+from .types import (
+    DeclareMode,
+    MessageType,
+    RabbitMQConfig,
+)
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.channel import Channel
+from pika.spec import (
+    Basic,
+    BasicProperties,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Union,
+)
+import asyncio
+import logging
+
+class AsyncDelivery:
+    """A delivery received by AsyncRabbitMQListener, acked or nacked by the consumer."""
+    __slots__ = ("messages", "routing_key", "properties", "_channel", "_delivery_tag")
+
+    def __init__(
+        self,
+        channel: Channel,
+        method: Basic.Deliver,
+        properties: BasicProperties,
+        messages: List[MessageType],
+    ) -> None:
+        self.messages = messages
+        self.routing_key: str = method.routing_key
+        self.properties = properties
+        self._channel = channel
+        self._delivery_tag: int = method.delivery_tag
+
+    def ack(self, multiple: bool = False) -> None:
+        """Ack this delivery (and, with multiple, every earlier unsettled one)."""
+        if self._channel.is_open:
+            self._channel.basic_ack(delivery_tag=self._delivery_tag, multiple=multiple)
+
+    def nack(self, requeue: bool = False, multiple: bool = False) -> None:
+        if self._channel.is_open:
+            self._channel.basic_nack(delivery_tag=self._delivery_tag, multiple=multiple, requeue=requeue)
+
+class AsyncRabbitMQListener(AsyncRabbitMQBaseClient):
+    """
+    Asyncio RabbitMQ listener with TLS support.
+
+    Deliveries are buffered in an asyncio queue (bounded in practice by the
+    prefetch count) and can be consumed with `async for delivery in listener`
+    or through consume(callback).
+    """
+    def __init__(
+        self,
+        logger: logging.Logger,
+        queue: str,
+        rabbitmq_config: RabbitMQConfig,
+        exchange: Optional[str] = None,
+        exchange_type: str = "direct",
+        routing_key: Optional[str] = None,
+        auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        binding_keys: Optional[List[str]] = None,
+    ) -> None:
+        super().__init__(
+            queue=queue,
+            rabbitmq_config=rabbitmq_config,
+            exchange=exchange,
+            exchange_type=exchange_type,
+            routing_key=routing_key,
+            auto_delete_queue=auto_delete_queue,
+            declare_mode=declare_mode,
+            binding_keys=binding_keys,
+        )
+        self._logger = logger
+        self._deliveries: asyncio.Queue[Optional[AsyncDelivery]] = asyncio.Queue()
+        self._consumer_tag: Optional[str] = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> AsyncDelivery:
+        if self._consumer_tag is None and self._deliveries.empty():
+            await self.start()
+        delivery = await self._deliveries.get()
+        if delivery is None:
+            raise StopAsyncIteration
+        return delivery
+
+    async def start(self) -> None:
+        """Start consuming; deliveries are buffered until iterated."""
+        if self._channel is None:
+            raise RuntimeError("Not connected. Make sure it is connected.")
+        if self._consumer_tag is not None:
+            return
+        self._consumer_tag = self._channel.basic_consume(
+            queue=self._queue,
+            on_message_callback=self._on_message,
+        )
+        self._logger.info(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Started async consuming from queue: {self._queue}")
+
+    async def stop(self) -> None:
+        """Cancel the consumer and end the iteration once buffered deliveries are read."""
+        if self._consumer_tag is not None and self._channel is not None and self._channel.is_open:
+            await self._rpc(lambda cb: self._channel.basic_cancel(self._consumer_tag, callback=cb))
+        self._consumer_tag = None
+        self._deliveries.put_nowait(None)
+
+    async def consume(
+        self,
+        callback: Union[
+            Callable[[MessageType, str], Awaitable[None]],
+            Callable[[MessageType, str, str], Awaitable[None]],
+        ],
+        one_use: bool = False,
+        with_routing_key: bool = False,
+    ) -> None:
+        """
+        Await callback for every message; ack on success, nack (no requeue) on failure.
+        With with_routing_key, it is called with (message, queue, routing_key).
+        """
+        await self.start()
+        async for delivery in self:
+            try:
+                for message in delivery.messages:
+                    if with_routing_key:
+                        routing_key = (delivery.properties.headers or {}).get(
+                            RetryTopology.ROUTING_KEY_HEADER,
+                            delivery.routing_key,
+                        )
+                        await callback(message, self._queue, routing_key)
+                    else:
+                        await callback(message, self._queue)
+                delivery.ack()
+            except Exception as e:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process message: Reason={e}", exc_info=True)
+                delivery.nack(requeue=False)
+            if one_use:
+                self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+                await self.stop()
+                break
+
+    async def consume_batches(
+        self,
+        callback: Callable[[List[MessageType], str], Awaitable[None]],
+        batch_size: int,
+        max_wait: float = 0.2,
+        requeue_failed: bool = False,
+        one_use: bool = False,
+    ) -> None:
+        """
+        Await callback with up to batch_size messages, collected for at most
+        max_wait seconds after the first one. Each batch is settled with a
+        single ack/nack(multiple=True); failed batches are requeued only with
+        requeue_failed.
+        """
+        assert batch_size > 0, "'batch_size' must be positive."
+        await self.start()
+        loop = asyncio.get_running_loop()
+        stopped = False
+        while not stopped:
+            delivery = await self._deliveries.get()
+            if delivery is None:
+                break
+            deliveries = [delivery]
+            count = len(delivery.messages)
+            deadline = loop.time() + max_wait
+            while count < batch_size:
+                try:
+                    delivery = await asyncio.wait_for(self._deliveries.get(), timeout=max(0.0, deadline - loop.time()))
+                except TimeoutError:
+                    break
+                if delivery is None:
+                    stopped = True
+                    break
+                deliveries.append(delivery)
+                count += len(delivery.messages)
+
+            last = deliveries[-1]
+            try:
+                await callback([m for d in deliveries for m in d.messages], self._queue)
+                last.ack(multiple=True)
+            except Exception as e:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process batch: Reason={e}", exc_info=True)
+                last.nack(requeue=requeue_failed, multiple=True)
+            if one_use:
+                self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+                await self.stop()
+                break
+
+    def _on_message(
+        self,
+        channel: Channel,
+        method: Basic.Deliver,
+        properties: BasicProperties,
+        body: bytes,
+    ) -> None:
+        try:
+            assert properties.content_type is not None, "Content type must be set."
+            payload = RabbitMQListener.parse_body(
+                body,
+                properties.content_type,
+                properties.content_encoding,
+            )
+            messages = RabbitMQListener.unpack_batch(payload, properties)
+        except Exception as e:
+            self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to parse message: Reason={e}", exc_info=True)
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        self._deliveries.put_nowait(AsyncDelivery(channel, method, properties, messages))
+
+    def _on_connection_closed(self, connection: AsyncioConnection, reason: BaseException) -> None:
+        super()._on_connection_closed(connection, reason)
+        # Unacked deliveries are redelivered by the broker; end the iteration
+        if self._consumer_tag is not None:
+            self._consumer_tag = None
+            self._deliveries.put_nowait(None)
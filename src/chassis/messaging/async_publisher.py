@@ -0,0 +1,188 @@
+from .async_client import AsyncRabbitMQBaseClient
+from .compression import (
+    compress_body,
+    get_compressor,
+)
+from .metrics import (
+    get_metrics,
+    PUBLISHED_AT_HEADER,
+)
+from .serializers import get_serializer
+from .types import (
+    DeclareMode,
+    MessageType,
+    RabbitMQConfig,
+)
+from collections import OrderedDict
+from pika import BasicProperties
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.channel import Channel
+from pika.frame import Method
+from pika.spec import Basic
+from typing import (
+    Any,
+    Optional,
+)
+import asyncio
+import time
+import uuid
+
+class AsyncRabbitMQPublisher(AsyncRabbitMQBaseClient):
+    """
+    Asyncio RabbitMQ publisher with TLS support.
+
+    The channel runs in confirm mode: `await publish(...)` returns once the
+    broker acked the message. At most max_in_flight messages wait for a
+    confirm at the same time, and publishing pauses while the broker reports
+    the connection as blocked, so callers get natural backpressure.
+    Compression and declarations work as in RabbitMQPublisher.
+    """
+    _APPLY_QOS = False
+    _DECLARE_UNNAMED_QUEUE = False
+
+    def __init__(
+        self,
+        queue: str,
+        rabbitmq_config: RabbitMQConfig,
+        exchange: Optional[str] = None,
+        exchange_type: str = "direct",
+        routing_key: Optional[str] = None,
+        auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        max_in_flight: int = 1000,
+        content_type: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        super().__init__(
+            queue=queue,
+            rabbitmq_config=rabbitmq_config,
+            exchange=exchange,
+            exchange_type=exchange_type,
+            routing_key=routing_key,
+            auto_delete_queue=auto_delete_queue,
+            declare_mode=declare_mode,
+        )
+        self._content_type = content_type if content_type is not None else self._CONTENT_TYPE
+        get_serializer(self._content_type)
+        if compression is not None:
+            get_compressor(compression)
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._unblocked = asyncio.Event()
+        self._unblocked.set()
+        self._delivery_tag = 0
+        self._confirms: OrderedDict[int, asyncio.Future[Any]] = OrderedDict()
+
+    async def publish(
+        self,
+        message: MessageType,
+        routing_key: Optional[str] = None,
+        exchange: Optional[str] = None,
+        persistent: bool = True,
+        content_type: Optional[str] = None,
+        message_id: Optional[str] = None,
+    ) -> None:
+        """
+        Publish a message to RabbitMQ and wait for the broker confirm.
+
+        Args:
+            routing_key: Routing key (queue name for default exchange)
+            message: Message to publish (serialized with the content type codec)
+            exchange: Exchange name (uses instance default if None)
+            persistent: Whether message should survive broker restart
+            content_type: Codec to use (uses instance default if None)
+            message_id: Id consumers deduplicate on (a random one if None)
+
+        Raises:
+            RuntimeError: If the broker could not be reached or nacked the message.
+        """
+        assert isinstance(message, dict), "'message' must be a dictionary type."
+        started = time.perf_counter()
+        target_exchange = exchange if exchange is not None else self._exchange
+        target_routing_key = routing_key if routing_key is not None else self._routing_key
+        serializer = get_serializer(content_type or self._content_type)
+        body, content_encoding = compress_body(
+            serializer.dumps(message),
+            self._compression,
+            self._compression_threshold,
+        )
+        await self._ensure_connected()
+        await self._unblocked.wait()
+
+        async with self._in_flight:
+            await self._ensure_connected()
+            assert self._channel is not None, "To publish, a channel must be created"
+
+            properties = BasicProperties(
+                content_type=serializer.content_type,
+                content_encoding=content_encoding,
+                delivery_mode=2 if persistent else 1,
+                message_id=message_id or uuid.uuid4().hex,
+                headers={PUBLISHED_AT_HEADER: time.time()},
+            )
+            confirm: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+            self._pending.add(confirm)
+            confirm.add_done_callback(self._pending.discard)
+            self._delivery_tag += 1
+            self._confirms[self._delivery_tag] = confirm
+
+            self._channel.basic_publish(
+                exchange=target_exchange,
+                routing_key=target_routing_key,
+                body=body,
+                properties=properties,
+            )
+            try:
+                await confirm
+            except Exception as e:
+                get_metrics().observe_publish(target_exchange, target_routing_key, time.perf_counter() - started, False)
+                raise RuntimeError(f"Message was not confirmed by RabbitMQ: {e}")
+            get_metrics().observe_publish(target_exchange, target_routing_key, time.perf_counter() - started, True)
+
+    async def _connect(self) -> None:
+        await super()._connect()
+        assert self._connection is not None, "Connection must be open"
+        self._connection.add_on_connection_blocked_callback(self._on_connection_blocked)
+        self._connection.add_on_connection_unblocked_callback(self._on_connection_unblocked)
+
+    async def _on_channel_open(self, channel: Channel) -> None:
+        await super()._on_channel_open(channel)
+        self._delivery_tag = 0
+        self._confirms.clear()
+        await self._rpc(lambda cb: channel.confirm_delivery(
+            ack_nack_callback=self._on_delivery_confirmation,
+            callback=cb,
+        ))
+
+    def _on_delivery_confirmation(self, frame: Method) -> None:
+        """Basic.Ack / Basic.Nack from the broker, possibly covering many tags."""
+        delivery_tag = frame.method.delivery_tag
+        if frame.method.multiple:
+            futures = []
+            while self._confirms and next(iter(self._confirms)) <= delivery_tag:
+                futures.append(self._confirms.popitem(last=False)[1])
+        else:
+            future = self._confirms.pop(delivery_tag, None)
+            futures = [future] if future is not None else []
+
+        nacked = isinstance(frame.method, Basic.Nack)
+        for future in futures:
+            if future.done():
+                continue
+            if nacked:
+                future.set_exception(RuntimeError("Message was nacked by the broker"))
+            else:
+                future.set_result(None)
+
+    def _on_connection_blocked(self, connection: AsyncioConnection, frame: Method) -> None:
+        self._unblocked.clear()
+
+    def _on_connection_unblocked(self, connection: AsyncioConnection, frame: Method) -> None:
+        self._unblocked.set()
+
+    def _on_connection_closed(self, connection: AsyncioConnection, reason: BaseException) -> None:
+        super()._on_connection_closed(connection, reason)
+        self._confirms.clear()
+        self._unblocked.set()
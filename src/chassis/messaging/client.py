@@ -1,4 +1,13 @@
-from .types import RabbitMQConfig
+from .topology import (
+    broker_key,
+    is_declared,
+    mark_declared,
+    TopologyItem,
+)
+from .types import (
+    DeclareMode,
+    RabbitMQConfig,
+)
 from pika import (
     BlockingConnection,
     ConnectionParameters,
@@ -8,15 +17,82 @@ from pika import (
 from pika.adapters.blocking_connection import BlockingChannel
 from types import TracebackType
 from typing import (
+    Any,
+    List,
     LiteralString,
     Optional,
+    Tuple,
     Type,
 )
 import ssl
 
+def build_connection_parameters(rabbitmq_config: RabbitMQConfig) -> ConnectionParameters:
+    """Build pika connection parameters (credentials and TLS) from the config."""
+    # Create credentials
+    credentials = PlainCredentials(rabbitmq_config["username"], rabbitmq_config["password"])
+    
+    # Configure TLS if enabled
+    if rabbitmq_config["use_tls"]:
+        ssl_context = ssl.create_default_context(
+            purpose=ssl.Purpose.SERVER_AUTH,
+            cafile=str(rabbitmq_config["ca_cert"]) if rabbitmq_config["ca_cert"] else None
+        )
+        
+        # Load client certificate if provided
+        if rabbitmq_config["client_cert"] and rabbitmq_config["client_key"]:
+            ssl_context.load_cert_chain(
+                certfile=str(rabbitmq_config["client_cert"]),
+                keyfile=str(rabbitmq_config["client_key"])
+            )
+        
+        # For development, you might want to disable hostname checking
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        
+        ssl_options = SSLOptions(ssl_context, rabbitmq_config["host"])
+    else:
+        ssl_options = None
+    
+    # Create connection parameters
+    return ConnectionParameters(
+        host=rabbitmq_config["host"],
+        port=rabbitmq_config["port"],
+        credentials=credentials,
+        ssl_options=ssl_options,
+        heartbeat=600,
+        blocked_connection_timeout=300,
+    )
+
+def config_key(rabbitmq_config: RabbitMQConfig) -> Tuple[Any, ...]:
+    """Broker identity of a config (prefetch is per channel, not per connection)."""
+    return (
+        rabbitmq_config["host"],
+        rabbitmq_config["port"],
+        rabbitmq_config["username"],
+        rabbitmq_config["password"],
+        rabbitmq_config["use_tls"],
+        rabbitmq_config["ca_cert"],
+        rabbitmq_config["client_cert"],
+        rabbitmq_config["client_key"],
+    )
+
 class RabbitMQBaseClient:
+    """
+    Base client owning the connection, channel and topology declarations.
+
+    declare_mode controls the declarations made on connect:
+        - "once": declare what this process has not declared on the broker yet.
+        - "always": declare on every connect.
+        - "passive": only check that the queue and exchange exist.
+        - "none": declare nothing (topology is set up elsewhere).
+    """
     _CONTENT_TYPE: LiteralString = "application/json"
+    _BATCH_HEADER: LiteralString = "x-chassis-batch"
     _DEFAULT_EXCHANGE: LiteralString = ""
+    # Consumers need the prefetch count; publishers do not
+    _APPLY_QOS: bool = True
+    # Whether queue="" declares a server-named queue (publishers skip it)
+    _DECLARE_UNNAMED_QUEUE: bool = True
 
     def __init__(
         self,
@@ -26,50 +102,26 @@ class RabbitMQBaseClient:
         exchange_type: str = "direct",
         routing_key: Optional[str] = None,
         auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        binding_keys: Optional[List[str]] = None,
     ) -> None:
+        if declare_mode not in ("once", "always", "passive", "none"):
+            raise ValueError(f"Unknown declare mode: {declare_mode}")
         self._queue = queue
         self._prefetch_count = rabbitmq_config["prefetch_count"]
         self._exchange = exchange if exchange is not None else self._DEFAULT_EXCHANGE
         self._exchange_type = exchange_type
         self._routing_key = routing_key if routing_key is not None else queue
+        # Keys (or topic patterns) the queue is bound with; defaults to the routing key
+        self._binding_keys = binding_keys if binding_keys else [self._routing_key]
         self._connection: Optional[BlockingConnection] = None
         self._channel: Optional[BlockingChannel] = None
         self._auto_delete = auto_delete_queue
+        self._owns_connection = True
         
-        # Create credentials
-        credentials = PlainCredentials(rabbitmq_config["username"], rabbitmq_config["password"])
-        
-        # Configure TLS if enabled
-        if rabbitmq_config["use_tls"]:
-            ssl_context = ssl.create_default_context(
-                purpose=ssl.Purpose.SERVER_AUTH,
-                cafile=str(rabbitmq_config["ca_cert"]) if rabbitmq_config["ca_cert"] else None
-            )
-            
-            # Load client certificate if provided
-            if rabbitmq_config["client_cert"] and rabbitmq_config["client_key"]:
-                ssl_context.load_cert_chain(
-                    certfile=str(rabbitmq_config["client_cert"]),
-                    keyfile=str(rabbitmq_config["client_key"])
-                )
-            
-            # For development, you might want to disable hostname checking
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            ssl_options = SSLOptions(ssl_context, rabbitmq_config["host"])
-        else:
-            ssl_options = None
-        
-        # Create connection parameters
-        self._params = ConnectionParameters(
-            host=rabbitmq_config["host"],
-            port=rabbitmq_config["port"],
-            credentials=credentials,
-            ssl_options=ssl_options,
-            heartbeat=600,
-            blocked_connection_timeout=300,
-        )
+        self._declare_mode = declare_mode
+        self._params = build_connection_parameters(rabbitmq_config)
+        self._broker = broker_key(self._params)
 
     def __enter__(self):
         """Context manager entry."""
@@ -86,36 +138,81 @@ class RabbitMQBaseClient:
         self._close()
         return None
 
-    def _connect(self) -> None:
-        """Establish connection to RabbitMQ"""
-        self._connection = BlockingConnection(self._params)
+    def _connect(self, connection: Optional[BlockingConnection] = None) -> None:
+        """
+        Establish connection to RabbitMQ.
+        If a connection is given, only a channel is opened on it and the
+        connection is left open on close.
+        """
+        self._owns_connection = connection is None
+        self._connection = connection if connection is not None else BlockingConnection(self._params)
         self._channel = self._connection.channel()
+        self._setup_channel()
+
+    def _setup_channel(self) -> None:
+        """
+        Set QoS and declare the queue, exchange and binding on the channel.
+        Depending on the declare mode, declarations already made on this
+        broker by any client of the process are skipped (see topology).
+        """
+        assert self._channel is not None, "A channel is required to declare the topology"
         
         # Set QoS (prefetch count)
-        self._channel.basic_qos(prefetch_count=self._prefetch_count)
+        if self._APPLY_QOS:
+            self._channel.basic_qos(prefetch_count=self._prefetch_count)
+        if self._declare_mode == "none":
+            return
+        passive = self._declare_mode == "passive"
+        has_queue = bool(self._queue) or self._DECLARE_UNNAMED_QUEUE
+        # Server-named and auto-delete queues can vanish, so they are never cached
+        cache_queue = bool(self._queue) and not self._auto_delete
         
         # Declare queue (idempotent)
-        self._channel.queue_declare(
-            queue=self._queue, 
-            durable=True,
-            auto_delete=self._auto_delete,
-        )
+        queue_item = ("queue", self._queue)
+        if has_queue and self._should_declare(queue_item, cache_queue):
+            self._channel.queue_declare(
+                queue=self._queue, 
+                durable=True,
+                auto_delete=self._auto_delete,
+                passive=passive,
+            )
+            self._mark_declared(queue_item, cache_queue)
 
         # If using custom exchange, bind queue to exchange
         if not self._is_default_exchange():
-            self._channel.exchange_declare(
-                exchange=self._exchange,
-                exchange_type=self._exchange_type,
-                durable=True
-            )
-            self._channel.queue_bind(
-                exchange=self._exchange,
-                queue=self._queue,
-                routing_key=self._routing_key
-            )
+            exchange_item = ("exchange", self._exchange)
+            if self._should_declare(exchange_item, True):
+                self._channel.exchange_declare(
+                    exchange=self._exchange,
+                    exchange_type=self._exchange_type,
+                    durable=True,
+                    passive=passive,
+                )
+                self._mark_declared(exchange_item, True)
+            # Bindings cannot be checked passively
+            for binding_key in self._binding_keys:
+                binding_item = ("binding", self._queue, self._exchange, binding_key)
+                if has_queue and not passive and self._should_declare(binding_item, cache_queue):
+                    self._channel.queue_bind(
+                        exchange=self._exchange,
+                        queue=self._queue,
+                        routing_key=binding_key
+                    )
+                    self._mark_declared(binding_item, cache_queue)
+
+    def _should_declare(self, item: TopologyItem, cacheable: bool) -> bool:
+        return self._declare_mode == "always" or not cacheable or not is_declared(self._broker, item)
+
+    def _mark_declared(self, item: TopologyItem, cacheable: bool) -> None:
+        if cacheable:
+            mark_declared(self._broker, item)
 
     def _close(self) -> None:
-        """Close connection"""
+        """Close connection (or only the channel on a shared connection)"""
+        if not self._owns_connection:
+            if self._channel is not None and self._channel.is_open:
+                self._channel.close()
+            return
         if self._connection and not self._connection.is_closed:
             self._connection.close()
 
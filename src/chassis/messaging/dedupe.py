@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Optional,
+    Protocol,
+)
+import threading
+import time
+
+class DeduplicationStore(Protocol):
+    """Persistent set of processed message ids (see dedupe_store.SqlDeduplicationStore)."""
+    def contains(self, message_id: str) -> bool: ...
+
+    def add(self, message_id: str) -> None: ...
+
+class MessageDeduplicator:
+    """
+    Remembers the ids of processed messages so redeliveries can be skipped.
+
+    Ids are kept in a bounded in-memory LRU (max_size entries, each expiring
+    ttl seconds after it was recorded). With a store, ids missing from memory
+    are looked up there and every processed id is also written to it. Ids are
+    recorded only once their message was handled successfully, so failed
+    messages are still redelivered.
+    """
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        ttl: float = 3600.0,
+        store: Optional[DeduplicationStore] = None,
+    ) -> None:
+        assert max_size > 0, "'max_size' must be positive."
+        self._max_size = max_size
+        self._ttl = ttl
+        self._store = store
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def persistent(self) -> bool:
+        """Whether ids are also written to a (blocking) store."""
+        return self._store is not None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._seen),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def is_duplicate(self, message_id: str) -> bool:
+        """Whether the message was processed already (counts a hit or a miss)."""
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._seen.get(message_id)
+            if expires_at is not None:
+                if expires_at > now:
+                    self._seen.move_to_end(message_id)
+                    self._hits += 1
+                    return True
+                del self._seen[message_id]
+        if self._store is not None and self._store.contains(message_id):
+            with self._lock:
+                self._remember(message_id, now)
+                self._hits += 1
+            return True
+        with self._lock:
+            self._misses += 1
+        return False
+
+    def mark_processed(self, message_id: str) -> None:
+        with self._lock:
+            self._remember(message_id, time.monotonic())
+        if self._store is not None:
+            self._store.add(message_id)
+
+    def _remember(self, message_id: str, now: float) -> None:
+        self._seen[message_id] = now + self._ttl
+        self._seen.move_to_end(message_id)
+        while len(self._seen) > self._max_size:
+            self._seen.popitem(last=False)
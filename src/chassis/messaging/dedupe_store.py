@@ -0,0 +1,90 @@
+from ..sql import (
+    BaseModel,
+    SessionLocal,
+)
+from .loop_runner import AsyncLoopRunner
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from sqlalchemy import (
+    Column,
+    DateTime,
+    String,
+    delete,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+from typing import Optional
+
+class ProcessedMessage(BaseModel):
+    """Id of a message that was handled successfully, kept by SqlDeduplicationStore."""
+    __tablename__ = "chassis_processed_messages"
+    message_id = Column(String(64), primary_key=True)
+    processed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class SqlDeduplicationStore:
+    """
+    Persistent set of processed message ids in the chassis_processed_messages
+    table, so duplicates are recognised across restarts and processes.
+
+    The calls are blocking: the async session runs on a dedicated event loop
+    thread (AsyncLoopRunner), so they must not be made from that loop's own
+    thread (listeners call them from other threads). Rows older than
+    retention seconds are ignored and can be removed with purge().
+    """
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        retention: float = 7 * 24 * 3600,
+        loop_runner: Optional[AsyncLoopRunner] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._retention = retention
+        self._runner = loop_runner or AsyncLoopRunner(name="chassis-dedupe-loop")
+
+    def contains(self, message_id: str) -> bool:
+        return self._runner.run(self._contains(message_id))
+
+    def add(self, message_id: str) -> None:
+        self._runner.run(self._add(message_id))
+
+    def purge(self) -> int:
+        """Delete the ids older than the retention; returns how many were removed."""
+        return self._runner.run(self._purge())
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self._retention)
+
+    async def _contains(self, message_id: str) -> bool:
+        async with self._session_factory() as db:
+            stmt = select(ProcessedMessage.processed_at).where(ProcessedMessage.message_id == message_id)
+            processed_at = (await db.execute(stmt)).scalar_one_or_none()
+        if processed_at is None:
+            return False
+        if processed_at.tzinfo is None:
+            # SQLite returns naive datetimes
+            processed_at = processed_at.replace(tzinfo=timezone.utc)
+        return processed_at >= self._cutoff()
+
+    async def _add(self, message_id: str) -> None:
+        async with self._session_factory() as db:
+            db.add(ProcessedMessage(message_id=message_id, processed_at=datetime.now(timezone.utc)))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Recorded already (e.g. by another consumer)
+                await db.rollback()
+
+    async def _purge(self) -> int:
+        async with self._session_factory() as db:
+            result = await db.execute(
+                delete(ProcessedMessage).where(ProcessedMessage.processed_at < self._cutoff())
+            )
+            await db.commit()
+        return result.rowcount
@@ -0,0 +1,184 @@
+from .client import (
+    build_connection_parameters,
+    config_key,
+)
+from .types import (
+    RabbitMQConfig,
+    RabbitMQHealthStatus,
+)
+from pika import BlockingConnection
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.frame import Method
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+)
+import threading
+import time
+
+class RabbitMQHealthMonitor:
+    """
+    Probes RabbitMQ in the background and caches the result.
+
+    One connection is kept open and checked every interval seconds with a
+    passive declare of the built-in amq.direct exchange (a single round
+    trip that creates nothing), reconnecting when it fails. The connection
+    also reports when the broker blocks publishers (resource alarms).
+    Readers get the last result in constant time; a result older than
+    three intervals counts as unhealthy.
+    """
+    _PROBE_EXCHANGE: str = "amq.direct"
+    _PUMP_INTERVAL: float = 1.0
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        interval: float = 10.0,
+    ) -> None:
+        self._params = build_connection_parameters(rabbitmq_config)
+        self._interval = interval
+        self._connection: Optional[BlockingConnection] = None
+        self._channel: Optional[BlockingChannel] = None
+        self._blocked = False
+        self._status: RabbitMQHealthStatus = {
+            "healthy": False,
+            "blocked": False,
+            "checked_at": None,
+            "latency": None,
+            "error": "Not probed yet",
+        }
+        self._probed = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> RabbitMQHealthStatus:
+        """Last probe result (a copy)."""
+        return self._status.copy()
+
+    def is_healthy(self) -> bool:
+        status = self._status
+        checked_at = status["checked_at"]
+        if checked_at is None or time.time() - checked_at > 3 * self._interval:
+            return False
+        return status["healthy"]
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="chassis-rabbitmq-health",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def wait_for_first_probe(self, timeout: Optional[float] = None) -> bool:
+        return self._probed.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            while not self._stopping.is_set():
+                self._probe()
+                self._probed.set()
+                self._pump(self._interval)
+        finally:
+            self._disconnect()
+
+    def _probe(self) -> None:
+        started = time.monotonic()
+        try:
+            if self._connection is None or not self._connection.is_open:
+                self._disconnect()
+                self._connect()
+            if self._channel is None or not self._channel.is_open:
+                assert self._connection is not None, "Probing requires a connection"
+                self._channel = self._connection.channel()
+            self._channel.exchange_declare(exchange=self._PROBE_EXCHANGE, passive=True)
+        except Exception as e:
+            self._disconnect()
+            self._set_status(False, None, f"{type(e).__name__}: {e}")
+            return
+        self._set_status(True, time.monotonic() - started, None)
+
+    def _pump(self, duration: float) -> None:
+        """Serve heartbeats and blocked/unblocked frames until the next probe."""
+        deadline = time.monotonic() + duration
+        while not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            step = min(remaining, self._PUMP_INTERVAL)
+            if self._connection is None or not self._connection.is_open:
+                self._stopping.wait(step)
+                continue
+            try:
+                self._connection.process_data_events(time_limit=step)
+            except Exception as e:
+                self._disconnect()
+                self._set_status(False, None, f"{type(e).__name__}: {e}")
+
+    def _connect(self) -> None:
+        self._blocked = False
+        connection = BlockingConnection(self._params)
+        connection.add_on_connection_blocked_callback(self._on_connection_blocked)
+        connection.add_on_connection_unblocked_callback(self._on_connection_unblocked)
+        self._connection = connection
+
+    def _disconnect(self) -> None:
+        connection, self._connection, self._channel = self._connection, None, None
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _set_status(self, reachable: bool, latency: Optional[float], error: Optional[str]) -> None:
+        # Replaced as a whole, so readers never see a half-updated status
+        self._status = {
+            "healthy": reachable and not self._blocked,
+            "blocked": self._blocked,
+            "checked_at": time.time(),
+            "latency": latency,
+            "error": error,
+        }
+
+    def _on_connection_blocked(self, connection: Any, frame: Method) -> None:
+        self._blocked = True
+        status = self._status
+        self._set_status(status["error"] is None, status["latency"], status["error"])
+
+    def _on_connection_unblocked(self, connection: Any, frame: Method) -> None:
+        self._blocked = False
+        status = self._status
+        self._set_status(status["error"] is None, status["latency"], status["error"])
+
+# Global Variables ############################################################
+_MONITORS: Dict[Tuple[Any, ...], RabbitMQHealthMonitor] = {}
+_MONITORS_LOCK = threading.Lock()
+
+# Functions ###################################################################
+def get_health_monitor(
+    rabbitmq_config: RabbitMQConfig,
+    interval: float = 10.0,
+) -> RabbitMQHealthMonitor:
+    """Return the process-wide (started) monitor for a broker."""
+    key = config_key(rabbitmq_config)
+    with _MONITORS_LOCK:
+        monitor = _MONITORS.get(key)
+        if monitor is None:
+            monitor = _MONITORS[key] = RabbitMQHealthMonitor(rabbitmq_config, interval)
+    monitor.start()
+    return monitor
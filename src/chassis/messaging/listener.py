@@ -1,24 +1,109 @@
 from .client import RabbitMQBaseClient
+from .compression import (
+    decompress_body,
+    get_compressor,
+)
+from .dedupe import MessageDeduplicator
+from .loop_runner import AsyncLoopRunner
+from .metrics import (
+    get_metrics,
+    PUBLISHED_AT_HEADER,
+)
+from .retry import RetryTopology
+from .serializers import get_serializer
 from .types import (
+    DeclareMode,
     MessageType,
     RabbitMQConfig,
+    RetryPolicy,
+)
+from collections import (
+    deque,
+    OrderedDict,
+)
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
 )
+from functools import partial
 from pika.adapters.blocking_connection import BlockingChannel
 from pika.spec import (
     Basic,
     BasicProperties,
 )
 from typing import (
+    Any,
+    Awaitable,
     Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    List,
     Optional,
+    Tuple,
+    Union,
 )
-import json
+import asyncio
+import copy
 import logging
+import threading
+import time
+
+type _Delivery = Tuple[Basic.Deliver, BasicProperties, bytes]
+type _ConsumerCallback = Callable[[MessageType, str], Optional[Awaitable[None]]]
+type _RoutedConsumerCallback = Callable[[MessageType, str, str], Optional[Awaitable[None]]]
+type _BatchConsumerCallback = Callable[[List[MessageType], str], Optional[Awaitable[None]]]
+type _OnMessage = Callable[[BlockingChannel, Basic.Deliver, BasicProperties, bytes], None]
+
+async def _await_in_order(awaitables: List[Awaitable[None]]) -> None:
+    for awaitable in awaitables:
+        await awaitable
+
+def _raise_failed(
+    messages: List[MessageType],
+    failed: Dict[int, BaseException],
+) -> None:
+    """Raise the error of a failed single message, or a PartialBatchError for a batch."""
+    if not failed:
+        return
+    if len(messages) == 1:
+        raise failed[0]
+    raise RabbitMQListener.PartialBatchError(messages, failed) from next(iter(failed.values()))
+
+async def _await_batch(
+    messages: List[MessageType],
+    awaitables: List[Tuple[int, Awaitable[None]]],
+    failed: Dict[int, BaseException],
+) -> None:
+    """Await every message's awaitable, then raise the failures of the batch."""
+    for index, awaitable in awaitables:
+        try:
+            await awaitable
+        except Exception as e:
+            failed[index] = e
+    _raise_failed(messages, failed)
 
 class RabbitMQListener(RabbitMQBaseClient):
     class OneUseInterrupt(Exception):
         pass
 
+    class PartialBatchError(Exception):
+        """Some messages of a published batch failed; the others were processed."""
+        def __init__(
+            self,
+            messages: List[MessageType],
+            failed: Dict[int, BaseException],
+        ) -> None:
+            self.messages = messages
+            # Index in the batch -> error
+            self.failed = failed
+            first = next(iter(failed.values()))
+            super().__init__(f"{len(failed)} of {len(messages)} batched messages failed (first: {type(first).__name__}: {first})")
+
+        @property
+        def failed_messages(self) -> List[MessageType]:
+            return [self.messages[index] for index in sorted(self.failed)]
+
     """RabbitMQ listener with TLS support"""
     def __init__(
         self,
@@ -29,6 +114,10 @@ class RabbitMQListener(RabbitMQBaseClient):
         exchange_type: str = "direct",
         routing_key: Optional[str] = None,
         auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        binding_keys: Optional[List[str]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        deduplicator: Optional[MessageDeduplicator] = None,
     ) -> None:
         super().__init__(
             queue=queue, 
@@ -37,39 +126,295 @@ class RabbitMQListener(RabbitMQBaseClient):
             exchange_type=exchange_type,
             routing_key=routing_key,
             auto_delete_queue=auto_delete_queue,
+            declare_mode=declare_mode,
+            binding_keys=binding_keys,
         )
         self._logger = logger
+        # Failed deliveries go to delayed retry queues instead of being dropped
+        self._retry = RetryTopology(queue, retry_policy) if retry_policy is not None else None
+        # Deliveries whose message id was processed already are acked unhandled
+        self._deduplicator = deduplicator
+
+    def _setup_channel(self) -> None:
+        super()._setup_channel()
+        if self._retry is None or self._declare_mode == "none":
+            return
+        assert self._channel is not None, "A channel is required to declare the topology"
+        for name, arguments in self._retry.queues().items():
+            item = ("queue", name)
+            if self._should_declare(item, True):
+                self._channel.queue_declare(
+                    queue=name,
+                    durable=True,
+                    passive=self._declare_mode == "passive",
+                    arguments=arguments or None,
+                )
+                self._mark_declared(item, True)
+
+    def _reject(
+        self,
+        ch: BlockingChannel,
+        method: Basic.Deliver,
+        properties: BasicProperties,
+        body: bytes,
+        error: BaseException,
+    ) -> None:
+        """
+        Settle a failed delivery: nack it, or schedule a retry and ack it.
+        A partially failed batch is retried with its failed messages only.
+        """
+        if self._retry is None:
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+        try:
+            if isinstance(error, RabbitMQListener.PartialBatchError):
+                properties, body = self._repack_failed(properties, error)
+            target = self._retry.republish(ch, method.routing_key, properties, body, error)
+        except Exception as e:
+            self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to schedule retry: Reason={e}", exc_info=True)
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        self._logger.info(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Message sent to {target}")
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    def _repack_failed(
+        self,
+        properties: BasicProperties,
+        error: "RabbitMQListener.PartialBatchError",
+    ) -> Tuple[BasicProperties, bytes]:
+        """Properties and body of a batch holding only the failed messages."""
+        assert properties.content_type is not None, "Content type must be set."
+        messages = error.failed_messages
+        body = get_serializer(properties.content_type).dumps(messages)
+        if properties.content_encoding:
+            body = get_compressor(properties.content_encoding).compress(body)
+        repacked = copy.copy(properties)
+        repacked.headers = {**(properties.headers or {}), RabbitMQBaseClient._BATCH_HEADER: len(messages)}
+        return repacked, body
+
+    def _is_duplicate(self, properties: BasicProperties) -> bool:
+        if self._deduplicator is None or properties.message_id is None:
+            return False
+        if not self._deduplicator.is_duplicate(properties.message_id):
+            return False
+        self._logger.info(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Skipping duplicate message: {properties.message_id}")
+        return True
+
+    def _mark_processed(self, properties: BasicProperties) -> None:
+        if self._deduplicator is not None and properties.message_id is not None:
+            self._deduplicator.mark_processed(properties.message_id)
+
+    async def _run_and_mark(
+        self,
+        pending: Coroutine[Any, Any, None],
+        properties: BasicProperties,
+    ) -> None:
+        """Run a handler coroutine, then record its message as processed."""
+        await pending
+        if self._deduplicator is not None and self._deduplicator.persistent:
+            # The store blocks (possibly on this very loop): keep it off the loop thread
+            await asyncio.to_thread(self._mark_processed, properties)
+        else:
+            self._mark_processed(properties)
+
+    def _observe(
+        self,
+        method: Basic.Deliver,
+        properties: BasicProperties,
+        started: float,
+        error: Optional[BaseException],
+    ) -> None:
+        """Record a settled delivery (started is its time.perf_counter() on arrival)."""
+        headers = properties.headers or {}
+        get_metrics().observe_consume(
+            self._queue,
+            method.routing_key,
+            time.perf_counter() - started,
+            error is None,
+            headers.get(PUBLISHED_AT_HEADER),
+        )
 
-    def _parse_json(
-        self, 
+    @staticmethod
+    def parse_body(
         body: bytes, 
-        content_type: str
-    ) -> MessageType:
-        assert content_type == RabbitMQBaseClient._CONTENT_TYPE, "Only valid content should be processed."
-        decoded_str = body.decode()
-        return json.loads(decoded_str)
+        content_type: str,
+        content_encoding: Optional[str] = None,
+    ) -> Any:
+        """Decompress (per content encoding) and decode a delivery body with the registered codecs."""
+        return get_serializer(content_type).loads(decompress_body(body, content_encoding))
+
+    @staticmethod
+    def unpack_batch(
+        payload: Any,
+        properties: BasicProperties,
+    ) -> List[MessageType]:
+        """Return the messages carried by a delivery, unpacking published batches."""
+        headers = properties.headers or {}
+        if RabbitMQBaseClient._BATCH_HEADER in headers:
+            assert isinstance(payload, list), "Batch payload must be a JSON array."
+            return payload
+        return [payload]
 
     def consume(
         self,
-        callback: Callable[[MessageType, str], None],
+        callback: Union[_ConsumerCallback, _RoutedConsumerCallback, _BatchConsumerCallback],
         auto_ack: bool = False,
         one_use: bool = False,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None,
+        ordered_by_routing_key: bool = False,
+        loop_runner: Optional[AsyncLoopRunner] = None,
+        batch_size: Optional[int] = None,
+        max_wait: float = 0.2,
+        requeue_failed: bool = False,
+        with_routing_key: bool = False,
     ) -> None:
-        def _on_message(
+        """
+        Consume messages from the queue until interrupted.
+        See start_consuming for the arguments.
+        """
+        if self._channel is None or self._connection is None:
+            raise RuntimeError("Not connected. Make sure it is connected.")
+        finish = self.start_consuming(
+            callback=callback,
+            auto_ack=auto_ack,
+            one_use=one_use,
+            concurrent=concurrent,
+            max_workers=max_workers,
+            ordered_by_routing_key=ordered_by_routing_key,
+            loop_runner=loop_runner,
+            batch_size=batch_size,
+            max_wait=max_wait,
+            requeue_failed=requeue_failed,
+            with_routing_key=with_routing_key,
+        )
+        try:
+            self._channel.start_consuming()
+        except RabbitMQListener.OneUseInterrupt:
+            self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+        except KeyboardInterrupt:
+            self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - Interrupted by user")
+        finally:
+            finish()
+
+    @property
+    def is_consuming(self) -> bool:
+        """Whether the channel still has active consumers."""
+        return self._channel is not None and self._channel.is_open and bool(self._channel.consumer_tags)
+
+    def start_consuming(
+        self,
+        callback: Union[_ConsumerCallback, _RoutedConsumerCallback, _BatchConsumerCallback],
+        auto_ack: bool = False,
+        one_use: bool = False,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None,
+        ordered_by_routing_key: bool = False,
+        loop_runner: Optional[AsyncLoopRunner] = None,
+        batch_size: Optional[int] = None,
+        max_wait: float = 0.2,
+        requeue_failed: bool = False,
+        with_routing_key: bool = False,
+    ) -> Callable[[], None]:
+        """
+        Register the consumer without blocking; the caller drives the
+        connection I/O (consume() does it with start_consuming). Returns a
+        function that stops consuming and waits for in-flight handlers.
+
+        If the callback returns an awaitable, it runs on a long-lived event
+        loop (loop_runner, or one owned by this call) and the delivery is
+        acked when it completes, or nacked if it raises. The connection
+        thread does not wait for it, so up to prefetch_count coroutines are
+        in flight. Failures are logged here, once per delivery. With a
+        persistent deduplication store, the duplicate lookup of each delivery
+        runs on a dedicated thread rather than the connection thread.
+
+        With batch_size set, the callback is called with (messages, queue)
+        once up to batch_size messages were collected or max_wait seconds
+        passed since the first one, and the whole batch is settled with a
+        single basic_ack/basic_nack(multiple=True). Batches always run on
+        the connection thread (concurrent is ignored).
+
+        Args:
+            callback: Called with (message, queue) for every message, or
+                with (messages, queue) for every batch
+            auto_ack: Let the broker consider messages acked on delivery
+            one_use: Stop after the first processed delivery
+            concurrent: Run callbacks in a thread pool instead of on the
+                connection thread; acks/nacks are marshalled back to it
+            max_workers: Pool size (defaults to the prefetch count)
+            ordered_by_routing_key: In concurrent mode, process deliveries
+                sharing a routing key one at a time, in arrival order
+            loop_runner: Event loop runner for awaitable callbacks
+            batch_size: Maximum number of messages per batch (enables batch mode)
+            max_wait: Seconds to wait for a batch to fill before flushing it
+            requeue_failed: Requeue the messages of a failed batch instead of
+                dropping (or dead-lettering) them
+            with_routing_key: Call the callback with (message, queue,
+                routing_key) in per-message mode (see routing_key_of)
+        """
+        if self._channel is None or self._connection is None:
+            raise RuntimeError("Not connected. Make sure it is connected.")
+        connection = self._connection
+
+        owns_runner = loop_runner is None
+        # prefetch_count 0 means unlimited: keep the runner's default limit then
+        runner = loop_runner or AsyncLoopRunner(
+            **({"max_in_flight": self._prefetch_count} if self._prefetch_count > 0 else {}),
+            name=f"rabbitmq-{self._queue}-loop",
+        )
+
+        def _settle(
+            ch: BlockingChannel, 
+            delivery: _Delivery, 
+            error: Optional[BaseException],
+        ) -> None:
+            # Runs on the connection thread
+            if auto_ack or not ch.is_open:
+                return
+            method, properties, body = delivery
+            if error is None:
+                ch.basic_ack(delivery_tag=method.delivery_tag)
+            else:
+                self._reject(ch, method, properties, body, error)
+
+        def _on_coroutine_done(
+            ch: BlockingChannel, 
+            delivery: _Delivery, 
+            started: float,
+            future: Future[None],
+        ) -> None:
+            # Runs on the loop thread
+            error = future.exception()
+            if error is not None:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process message: Reason={error}", exc_info=error)
+            self._observe(delivery[0], delivery[1], started, error)
+            connection.add_callback_threadsafe(partial(_settle, ch, delivery, error))
+            if one_use:
+                self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+                connection.add_callback_threadsafe(ch.stop_consuming)
+
+        def _handle(
             ch: BlockingChannel,
-            method: Basic.Deliver,
-            properties: BasicProperties,
-            body: bytes
+            delivery: _Delivery,
+            started: float,
+            is_duplicate: Callable[[], bool],
         ) -> None:
+            # Runs on the connection thread
+            method, properties, body = delivery
             try:
-                assert properties.content_type is not None, "Content type must be set."
-                message = self._parse_json(
-                    body=body,
-                    content_type=properties.content_type,
-                )
-                if self._queue is None:
-                    raise RuntimeError("Listener must have a queue defined")
-                callback(message, self._queue)
+                if is_duplicate():
+                    if not auto_ack:
+                        ch.basic_ack(delivery_tag=method.delivery_tag)
+                    return
+                pending = self._process_delivery(callback, method, properties, body, with_routing_key)
+                if pending is not None:
+                    # Ack once the coroutine completes (and its message is marked processed)
+                    future = runner.submit(self._run_and_mark(pending, properties))
+                    future.add_done_callback(partial(_on_coroutine_done, ch, delivery, started))
+                    return
+                self._mark_processed(properties)
+                self._observe(method, properties, started, None)
                 if not auto_ack:
                     ch.basic_ack(delivery_tag=method.delivery_tag)
                 if one_use:
@@ -78,31 +423,337 @@ class RabbitMQListener(RabbitMQBaseClient):
                 raise
             except Exception as e:
                 self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process message: Reason={e}", exc_info=True)
+                self._observe(method, properties, started, e)
                 if not auto_ack:
-                    ch.basic_nack(
-                        delivery_tag=method.delivery_tag,
-                        requeue=False
-                    )                
+                    self._reject(ch, method, properties, body, e)
 
-        if self._channel is None:
-            raise RuntimeError("Not connected. Make sure it is connected.")
+        # A persistent deduplication store blocks on I/O, so its lookups run
+        # on their own thread, one at a time to keep the delivery order
+        lookups: Optional[ThreadPoolExecutor] = None
+        if batch_size is None and not concurrent and self._deduplicator is not None and self._deduplicator.persistent:
+            lookups = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"rabbitmq-{self._queue}-dedupe")
+
+        def _on_message(
+            ch: BlockingChannel,
+            method: Basic.Deliver,
+            properties: BasicProperties,
+            body: bytes
+        ) -> None:
+            started = time.perf_counter()
+            delivery = (method, properties, body)
+            if lookups is None:
+                _handle(ch, delivery, started, partial(self._is_duplicate, properties))
+                return
+            # Handled back on the connection thread once looked up
+            lookup = lookups.submit(self._is_duplicate, properties)
+            lookup.add_done_callback(
+                lambda done: connection.add_callback_threadsafe(partial(_handle, ch, delivery, started, done.result))
+            )
+
+        executor: Optional[ThreadPoolExecutor] = None
+        flush_batch: Optional[Callable[[], None]] = None
+        on_message_callback: _OnMessage = _on_message
+        if batch_size is not None:
+            assert batch_size > 0, "'batch_size' must be positive."
+            on_message_callback, flush_batch = self._make_batch_dispatcher(
+                callback=callback,
+                batch_size=batch_size,
+                max_wait=max_wait,
+                auto_ack=auto_ack,
+                one_use=one_use,
+                requeue_failed=requeue_failed,
+                runner=runner,
+            )
+        elif concurrent:
+            executor = ThreadPoolExecutor(
+                # None (prefetch_count 0) picks the executor's default size
+                max_workers=max_workers or self._prefetch_count or None,
+                thread_name_prefix=f"rabbitmq-{self._queue}",
+            )
+            on_message_callback = self._make_concurrent_dispatcher(
+                executor=executor,
+                callback=callback,
+                auto_ack=auto_ack,
+                one_use=one_use,
+                ordered_by_routing_key=ordered_by_routing_key,
+                runner=runner,
+                with_routing_key=with_routing_key,
+            )
         
         # Start consuming
+        assert self._channel is not None, "Not connected. Make sure it is connected."
         self._channel.basic_consume(
             queue=self._queue,
-            on_message_callback=_on_message,
+            on_message_callback=on_message_callback,
             auto_ack=auto_ack,
         )
 
         self._logger.info(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Started consuming from queue: {self._queue}")
-        try:
-            self._channel.start_consuming()
-        except RabbitMQListener.OneUseInterrupt:
-            self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
-        except KeyboardInterrupt:
-            self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - Interrupted by user")
-        finally:
-            self._channel.stop_consuming()
+
+        def _finish() -> None:
+            if self._channel is not None and self._channel.is_open:
+                self._channel.stop_consuming()
+            # Hand over the partially filled batch before shutting down
+            if flush_batch is not None:
+                flush_batch()
+            # Let running handlers finish and deliver their pending acks
+            if executor is not None:
+                executor.shutdown(wait=True)
+            if lookups is not None:
+                lookups.shutdown(wait=True)
+                # Handle the deliveries looked up after consuming stopped
+                if connection.is_open and not one_use:
+                    connection.process_data_events(time_limit=0)
+            if owns_runner:
+                runner.stop()
+            if connection.is_open:
+                connection.process_data_events(time_limit=0)
+
+        return _finish
+
+    @staticmethod
+    def routing_key_of(method: Basic.Deliver, properties: BasicProperties) -> str:
+        """Routing key a delivery was originally published with (retries keep it in a header)."""
+        headers = properties.headers or {}
+        return headers.get(RetryTopology.ROUTING_KEY_HEADER, method.routing_key)
+
+    def _process_delivery(
+        self,
+        callback: Union[_ConsumerCallback, _RoutedConsumerCallback],
+        method: Basic.Deliver,
+        properties: BasicProperties,
+        body: bytes,
+        with_routing_key: bool = False,
+    ) -> Optional[Coroutine[Any, Any, None]]:
+        """
+        Parse a delivery and run the callback for every message it carries.
+        Awaitables returned by the callback are combined into one coroutine.
+
+        Every message of a batch runs even if another one fails; the
+        failures are then raised together as a PartialBatchError, so only
+        those messages are retried.
+        """
+        assert properties.content_type is not None, "Content type must be set."
+        payload = self.parse_body(
+            body=body,
+            content_type=properties.content_type,
+            content_encoding=properties.content_encoding,
+        )
+        if self._queue is None:
+            raise RuntimeError("Listener must have a queue defined")
+        messages = self.unpack_batch(payload, properties)
+        awaitables: List[Tuple[int, Awaitable[None]]] = []
+        failed: Dict[int, BaseException] = {}
+        routing_key = self.routing_key_of(method, properties) if with_routing_key else None
+        for index, message in enumerate(messages):
+            try:
+                if routing_key is not None:
+                    result = callback(message, self._queue, routing_key)
+                else:
+                    result = callback(message, self._queue)
+            except Exception as e:
+                failed[index] = e
+                continue
+            if result is not None:
+                awaitables.append((index, result))
+        if awaitables:
+            return _await_batch(messages, awaitables, failed)
+        _raise_failed(messages, failed)
+        return None
+
+    def _make_batch_dispatcher(
+        self,
+        callback: _BatchConsumerCallback,
+        batch_size: int,
+        max_wait: float,
+        auto_ack: bool,
+        one_use: bool,
+        requeue_failed: bool,
+        runner: AsyncLoopRunner,
+    ) -> Tuple[_OnMessage, Callable[[], None]]:
+        """
+        Build an on_message callback that collects deliveries into batches,
+        and a function flushing the current batch. Everything except
+        awaitable callbacks runs on the connection thread.
+        """
+        assert self._connection is not None and self._channel is not None, "Not connected. Make sure it is connected."
+        if self._queue is None:
+            raise RuntimeError("Listener must have a queue defined")
+        connection = self._connection
+        channel = self._channel
+        queue = self._queue
+        messages: List[MessageType] = []
+        last_tag = 0
+        timer: Optional[Any] = None
+        # Last delivery tag of every handed-over batch -> success (None while
+        # running). Batches are settled in delivery order, so multiple=True
+        # never covers deliveries of a batch that is still running.
+        results: OrderedDict[int, Optional[bool]] = OrderedDict()
+
+        def _settle_ready() -> None:
+            while results:
+                delivery_tag, success = next(iter(results.items()))
+                if success is None:
+                    return
+                results.popitem(last=False)
+                if auto_ack or not channel.is_open:
+                    continue
+                if success:
+                    channel.basic_ack(delivery_tag=delivery_tag, multiple=True)
+                else:
+                    channel.basic_nack(delivery_tag=delivery_tag, multiple=True, requeue=requeue_failed)
+
+        def _complete(delivery_tag: int, success: bool) -> None:
+            # Runs on the connection thread
+            results[delivery_tag] = success
+            _settle_ready()
+            if one_use:
+                self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+                if channel.is_open:
+                    channel.stop_consuming()
+
+        def _on_coroutine_done(delivery_tag: int, future: Future[None]) -> None:
+            # Runs on the loop thread
+            error = future.exception()
+            if error is not None:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process batch: Reason={error}", exc_info=error)
+            connection.add_callback_threadsafe(partial(_complete, delivery_tag, error is None))
+
+        def _flush() -> None:
+            nonlocal timer
+            if timer is not None:
+                connection.remove_timeout(timer)
+                timer = None
+            if not messages:
+                return
+            batch, delivery_tag = list(messages), last_tag
+            messages.clear()
+            results[delivery_tag] = None
+            try:
+                pending = callback(batch, queue)
+            except Exception as e:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process batch: Reason={e}", exc_info=True)
+                _complete(delivery_tag, False)
+                return
+            if pending is None:
+                _complete(delivery_tag, True)
+                return
+            # Settle once the coroutine completes
+            future = runner.submit(_await_in_order([pending]))
+            future.add_done_callback(partial(_on_coroutine_done, delivery_tag))
+
+        def _on_timeout() -> None:
+            nonlocal timer
+            timer = None
+            _flush()
+
+        def _on_message(
+            ch: BlockingChannel,
+            method: Basic.Deliver,
+            properties: BasicProperties,
+            body: bytes
+        ) -> None:
+            nonlocal last_tag, timer
+            try:
+                assert properties.content_type is not None, "Content type must be set."
+                payload = self.parse_body(
+                    body=body,
+                    content_type=properties.content_type,
+                    content_encoding=properties.content_encoding,
+                )
+                unpacked = self.unpack_batch(payload, properties)
+            except Exception as e:
+                self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to parse message: Reason={e}", exc_info=True)
+                if not auto_ack:
+                    ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                return
+            messages.extend(unpacked)
+            last_tag = method.delivery_tag
+            if len(messages) >= batch_size:
+                _flush()
+            elif timer is None:
+                timer = connection.call_later(max_wait, _on_timeout)
+
+        return _on_message, _flush
+
+    def _make_concurrent_dispatcher(
+        self,
+        executor: ThreadPoolExecutor,
+        callback: Union[_ConsumerCallback, _RoutedConsumerCallback],
+        auto_ack: bool,
+        one_use: bool,
+        ordered_by_routing_key: bool,
+        runner: AsyncLoopRunner,
+        with_routing_key: bool = False,
+    ) -> _OnMessage:
+        """Build an on_message callback that hands deliveries to the pool."""
+        assert self._connection is not None, "Not connected. Make sure it is connected."
+        connection = self._connection
+        lock = threading.Lock()
+        # Deliveries waiting for a routing key that is already being processed
+        busy_keys: Dict[str, Deque[_Delivery]] = {}
+
+        def _settle(
+            ch: BlockingChannel, 
+            delivery: _Delivery, 
+            error: Optional[BaseException],
+        ) -> None:
+            # Runs on the connection thread
+            if not ch.is_open:
+                return
+            method, properties, body = delivery
+            if error is None:
+                ch.basic_ack(delivery_tag=method.delivery_tag)
+            else:
+                self._reject(ch, method, properties, body, error)
+
+        def _work(ch: BlockingChannel, key: Optional[str], delivery: _Delivery) -> None:
+            while True:
+                method, properties, body = delivery
+                started = time.perf_counter()
+                error: Optional[BaseException] = None
+                try:
+                    if not self._is_duplicate(properties):
+                        pending = self._process_delivery(callback, method, properties, body, with_routing_key)
+                        if pending is not None:
+                            runner.run(pending)
+                        self._mark_processed(properties)
+                        self._observe(method, properties, started, None)
+                except Exception as e:
+                    error = e
+                    self._logger.error(f"[LOG:CHASSIS:RABBITMQ_LISTENER] - Failed to process message: Reason={e}", exc_info=True)
+                    self._observe(method, properties, started, e)
+                if not auto_ack:
+                    connection.add_callback_threadsafe(partial(_settle, ch, delivery, error))
+                if one_use:
+                    self._logger.info("[LOG:CHASSIS:RABBITMQ_LISTENER] - One-use interrupt")
+                    connection.add_callback_threadsafe(ch.stop_consuming)
+                    return
+                if key is None:
+                    return
+                with lock:
+                    pending = busy_keys[key]
+                    if not pending:
+                        del busy_keys[key]
+                        return
+                    delivery = pending.popleft()
+
+        def _on_message(
+            ch: BlockingChannel,
+            method: Basic.Deliver,
+            properties: BasicProperties,
+            body: bytes
+        ) -> None:
+            key = method.routing_key if ordered_by_routing_key else None
+            if key is not None:
+                with lock:
+                    if key in busy_keys:
+                        busy_keys[key].append((method, properties, body))
+                        return
+                    busy_keys[key] = deque()
+            executor.submit(_work, ch, key, (method, properties, body))
+
+        return _on_message
 
 #### EXAMPLES
 # # Custom topic exchange (automatic binding)
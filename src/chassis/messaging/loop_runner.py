@@ -0,0 +1,118 @@
+from concurrent.futures import (
+    Future,
+    wait,
+)
+from typing import (
+    Any,
+    Coroutine,
+    Optional,
+    Set,
+    TypeVar,
+)
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+class AsyncLoopRunner:
+    """
+    Runs coroutines on one long-lived event loop in a dedicated thread.
+
+    Lets sync code (such as the pika listener thread) hand async handlers to
+    a loop that survives across messages, so async DB sessions or HTTP clients
+    can be reused. At most max_in_flight coroutines run at the same time;
+    the others wait for a slot on the loop, so submit() never blocks the
+    caller (the pika connection thread must keep doing I/O and heartbeats).
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 100,
+        name: str = "chassis-async-loop",
+    ) -> None:
+        assert max_in_flight > 0, "'max_in_flight' must be positive."
+        self._name = name
+        self._max_in_flight = max_in_flight
+        # Created on the loop thread by the first coroutine
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight: Set[Future[Any]] = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's event loop (started on first use)."""
+        self.start()
+        assert self._loop is not None, "Loop must be started"
+        return self._loop
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=self._name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule a coroutine on the loop and return a thread-safe future."""
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro), self.loop)
+        self._in_flight.add(future)
+        future.add_done_callback(self._in_flight.discard)
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the loop and wait for its result."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() called from the runner's own loop thread would deadlock")
+        return self.submit(coro).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Wait for in-flight coroutines, then stop the loop and its thread."""
+        with self._lock:
+            thread, loop = self._thread, self._loop
+            self._thread = None
+        if thread is None or loop is None:
+            return
+        wait(list(self._in_flight), timeout=timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+    async def _limited(self, coro: Coroutine[Any, Any, T]) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            # Cancelled while waiting for a slot
+            coro.close()
+            raise
+        try:
+            return await coro
+        finally:
+            self._slots.release()
+
+    def _run(self) -> None:
+        assert self._loop is not None, "Loop must be created before running"
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
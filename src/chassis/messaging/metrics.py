@@ -0,0 +1,205 @@
+from bisect import bisect_left
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    LiteralString,
+    Optional,
+    Tuple,
+)
+import threading
+import time
+
+type StatsSource = Callable[[], Dict[str, Any]]
+
+# Upper bounds (seconds) of the latency buckets; one more bucket holds the rest
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+# Header with the wall-clock time (epoch seconds) a message was published at
+PUBLISHED_AT_HEADER: LiteralString = "x-chassis-published-at"
+# Routing keys beyond this many series per queue/exchange are folded into one
+_MAX_ROUTING_KEYS: int = 256
+_OTHER_ROUTING_KEY: LiteralString = "__other__"
+
+class LatencyHistogram:
+    """Fixed-bucket histogram: observe() is one bisect and three additions."""
+    __slots__ = ("_counts", "count", "total")
+
+    def __init__(self) -> None:
+        self._counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts keyed by upper bound, as in Prometheus."""
+        buckets: Dict[str, int] = {}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": buckets,
+        }
+
+class _Series:
+    __slots__ = ("succeeded", "failed", "latency", "time_in_queue")
+
+    def __init__(self, with_time_in_queue: bool) -> None:
+        self.succeeded = 0
+        self.failed = 0
+        self.latency = LatencyHistogram()
+        self.time_in_queue = LatencyHistogram() if with_time_in_queue else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "latency": self.latency.snapshot(),
+        }
+        if self.time_in_queue is not None:
+            snapshot["time_in_queue"] = self.time_in_queue.snapshot()
+        return snapshot
+
+class MessagingMetrics:
+    """
+    In-process counters and latency histograms of the messaging clients.
+
+    Series are kept per (queue, routing key) for consumed deliveries, per
+    queue for registered handlers and per (exchange, routing key) for
+    publishes. Recording takes one lock and a few additions, so it is left
+    on by default; set enabled to False to turn it off.
+    """
+    def __init__(self) -> None:
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._consumed: Dict[Tuple[str, str], _Series] = {}
+        self._handled: Dict[Tuple[str, str], _Series] = {}
+        self._published: Dict[Tuple[str, str], _Series] = {}
+        # Number of routing key series per (kind, queue or exchange)
+        self._routing_keys: Dict[Tuple[str, str], int] = {}
+        self._sources: Dict[str, StatsSource] = {}
+
+    def observe_consume(
+        self,
+        queue: str,
+        routing_key: str,
+        seconds: float,
+        success: bool,
+        published_at: Optional[float] = None,
+    ) -> None:
+        """Record a settled delivery; published_at gives its time in queue."""
+        if not self.enabled:
+            return
+        time_in_queue = None
+        if published_at is not None:
+            # Time waited before processing started
+            time_in_queue = max(0.0, time.time() - seconds - published_at)
+        with self._lock:
+            series = self._series(self._consumed, "consumed", queue, routing_key, True)
+            self._record(series, seconds, success)
+            if time_in_queue is not None and series.time_in_queue is not None:
+                series.time_in_queue.observe(time_in_queue)
+
+    def observe_handler(self, queue: str, seconds: float, success: bool) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._record(self._series(self._handled, "handled", queue, "", False), seconds, success)
+
+    def observe_publish(
+        self,
+        exchange: str,
+        routing_key: str,
+        seconds: float,
+        success: bool,
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._record(self._series(self._published, "published", exchange, routing_key, False), seconds, success)
+
+    def register_source(self, name: str, source: StatsSource) -> None:
+        """Include the stats returned by source (e.g. a spool or relay) in snapshots."""
+        with self._lock:
+            self._sources[name] = source
+
+    def unregister_source(self, name: str) -> None:
+        with self._lock:
+            self._sources.pop(name, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = {
+                "consumed": [
+                    {"queue": queue, "routing_key": routing_key, **series.snapshot()}
+                    for (queue, routing_key), series in self._consumed.items()
+                ],
+                "handled": [
+                    {"queue": queue, **series.snapshot()}
+                    for (queue, _), series in self._handled.items()
+                ],
+                "published": [
+                    {"exchange": exchange, "routing_key": routing_key, **series.snapshot()}
+                    for (exchange, routing_key), series in self._published.items()
+                ],
+            }
+            sources = list(self._sources.items())
+        # Sources take their own locks
+        snapshot["sources"] = {name: source() for name, source in sources}
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._consumed.clear()
+            self._handled.clear()
+            self._published.clear()
+            self._routing_keys.clear()
+
+    def _series(
+        self,
+        series: Dict[Tuple[str, str], _Series],
+        kind: str,
+        name: str,
+        routing_key: str,
+        with_time_in_queue: bool,
+    ) -> _Series:
+        key = (name, routing_key)
+        found = series.get(key)
+        if found is not None:
+            return found
+        count = self._routing_keys.get((kind, name), 0)
+        if count >= _MAX_ROUTING_KEYS:
+            key = (name, _OTHER_ROUTING_KEY)
+            found = series.get(key)
+            if found is not None:
+                return found
+        else:
+            self._routing_keys[(kind, name)] = count + 1
+        found = series[key] = _Series(with_time_in_queue)
+        return found
+
+    @staticmethod
+    def _record(series: _Series, seconds: float, success: bool) -> None:
+        if success:
+            series.succeeded += 1
+        else:
+            series.failed += 1
+        series.latency.observe(seconds)
+
+# Global Variables ############################################################
+_METRICS = MessagingMetrics()
+
+# Functions ###################################################################
+def get_metrics() -> MessagingMetrics:
+    """Return the process-wide messaging metrics."""
+    return _METRICS
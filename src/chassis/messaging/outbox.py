@@ -0,0 +1,333 @@
+from ..sql import (
+    BaseModel,
+    SessionLocal,
+)
+from .compression import compress_body
+from .metrics import get_metrics
+from .publisher import (
+    _Outgoing,
+    RabbitMQPublisher,
+)
+from .serializers import get_serializer
+from .types import (
+    MessageType,
+    RabbitMQConfig,
+)
+from concurrent.futures import ThreadPoolExecutor
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from pika import BasicProperties
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    JSON,
+    LargeBinary,
+    String,
+    delete,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.sql import func
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+import asyncio
+import logging
+import uuid
+
+# Global Variables ############################################################
+logger = logging.getLogger(__name__)
+
+class OutboxMessage(BaseModel):
+    """Message written in the caller's transaction and published later by OutboxRelay."""
+    __tablename__ = "chassis_outbox"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    exchange = Column(String(255), nullable=False, default="")
+    routing_key = Column(String(255), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    content_type = Column(String(128), nullable=False)
+    content_encoding = Column(String(32), nullable=True)
+    delivery_mode = Column(Integer, nullable=False, default=2)
+    message_id = Column(String(64), nullable=False)
+    headers = Column(JSON, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Publish attempts so far, and when the row may be claimed again
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Set once max_attempts were used up; such rows are no longer relayed
+    failed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+# Functions ###################################################################
+def enqueue_message(
+    db: AsyncSession,
+    message: MessageType,
+    routing_key: str,
+    exchange: str = "",
+    persistent: bool = True,
+    content_type: str = "application/json",
+    compression: Optional[str] = None,
+    compression_threshold: int = 1024,
+    headers: Optional[Dict[str, Any]] = None,
+) -> OutboxMessage:
+    """
+    Add a message to the outbox in the session's transaction.
+    It is published by OutboxRelay only if the transaction commits.
+    """
+    assert isinstance(message, dict), "'message' must be a dictionary type."
+    serializer = get_serializer(content_type)
+    body, content_encoding = compress_body(serializer.dumps(message), compression, compression_threshold)
+    row = OutboxMessage(
+        exchange=exchange,
+        routing_key=routing_key,
+        body=body,
+        content_type=serializer.content_type,
+        content_encoding=content_encoding,
+        delivery_mode=2 if persistent else 1,
+        message_id=uuid.uuid4().hex,
+        headers=headers,
+    )
+    db.add(row)
+    return row
+
+class OutboxRelay:
+    """
+    Publishes outbox rows in batches with publisher confirms.
+
+    Each poll claims up to batch_size due rows in id order (locked with
+    SKIP LOCKED where the database supports it, so several relays can run)
+    and commits the claim, which leases the rows for the publish. The rows
+    are then published on one confirm-mode channel, without holding the
+    transaction. Confirmed rows are deleted (or marked as sent, with
+    delete_sent=False) with one statement. Rows that were not confirmed are
+    retried after retry_delay seconds, doubled per attempt up to
+    max_retry_delay, so they never hold back the rows behind them. After
+    max_attempts they are parked with failed_at set. Delivery is
+    at-least-once, and a retried row may be published after newer ones.
+
+    The blocking publisher runs on one dedicated thread.
+    """
+    # Extra lease time, besides confirm_timeout, for connecting and settling
+    _CLAIM_MARGIN: float = 60.0
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        confirm_timeout: float = 30.0,
+        delete_sent: bool = True,
+        max_attempts: Optional[int] = 10,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        assert batch_size > 0, "'batch_size' must be positive."
+        assert max_attempts is None or max_attempts > 0, "'max_attempts' must be positive."
+        self._rabbitmq_config = rabbitmq_config
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._confirm_timeout = confirm_timeout
+        self._delete_sent = delete_sent
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chassis-outbox")
+        self._publisher: Optional[RabbitMQPublisher] = None
+        self._stopping = asyncio.Event()
+
+        # Counters
+        self._published = 0
+        self._failed = 0
+        self._parked = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "published": self._published,
+            "failed": self._failed,
+            "parked": self._parked,
+        }
+
+    async def run(self) -> None:
+        """Relay until stop() is called; polls right away while batches are full."""
+        self._stopping.clear()
+        get_metrics().register_source("outbox_relay", lambda: self.stats)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    relayed = await self.run_once()
+                except Exception as e:
+                    logger.error(f"[LOG:CHASSIS:OUTBOX] - Relay error: Reason={e}", exc_info=True)
+                    relayed = 0
+                if relayed < self._batch_size:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self._poll_interval)
+                    except TimeoutError:
+                        pass
+        finally:
+            get_metrics().unregister_source("outbox_relay")
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._disconnect)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run_once(self) -> int:
+        """Relay one batch; returns the number of rows published."""
+        loop = asyncio.get_running_loop()
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+        outgoing = [message for _, _, message in claimed]
+        failed = await loop.run_in_executor(self._executor, self._publish, outgoing)
+        sent_ids = [row_id for index, (row_id, _, _) in enumerate(claimed) if index not in failed]
+        retries = [(row_id, attempts) for index, (row_id, attempts, _) in enumerate(claimed) if index in failed]
+        await self._settle(sent_ids, retries)
+
+        self._published += len(sent_ids)
+        self._failed += len(failed)
+        return len(sent_ids)
+
+    async def _claim(self) -> List[Tuple[int, int, _Outgoing]]:
+        """Lease the next due rows; returns (id, attempts, message) for each."""
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as db:
+            stmt = (
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.sent_at.is_(None),
+                    OutboxMessage.failed_at.is_(None),
+                    or_(OutboxMessage.next_attempt_at.is_(None), OutboxMessage.next_attempt_at <= now),
+                )
+                .order_by(OutboxMessage.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = list((await db.execute(stmt)).scalars().all())
+            claimed: List[Tuple[int, int, _Outgoing]] = [
+                (
+                    row.id,
+                    row.attempts + 1,
+                    (
+                        row.exchange,
+                        row.routing_key,
+                        row.body,
+                        BasicProperties(
+                            content_type=row.content_type,
+                            content_encoding=row.content_encoding,
+                            delivery_mode=row.delivery_mode,
+                            message_id=row.message_id,
+                            headers=row.headers,
+                        ),
+                    ),
+                )
+                for row in rows
+            ]
+            if claimed:
+                # Other relays skip leased rows; a crashed relay's rows come back once the lease ends
+                await db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_([row_id for row_id, _, _ in claimed]))
+                    .values(
+                        attempts=OutboxMessage.attempts + 1,
+                        next_attempt_at=now + timedelta(seconds=self._confirm_timeout + self._CLAIM_MARGIN),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+        return claimed
+
+    async def _settle(self, sent_ids: List[int], retries: List[Tuple[int, int]]) -> None:
+        """Remove (or mark) the sent rows and schedule or park the failed ones."""
+        now = datetime.now(timezone.utc)
+        retry_at: Dict[int, List[int]] = {}
+        parked: List[int] = []
+        for row_id, attempts in retries:
+            if self._max_attempts is not None and attempts >= self._max_attempts:
+                parked.append(row_id)
+            else:
+                retry_at.setdefault(attempts, []).append(row_id)
+        async with self._session_factory() as db:
+            if sent_ids:
+                if self._delete_sent:
+                    await db.execute(
+                        delete(OutboxMessage)
+                        .where(OutboxMessage.id.in_(sent_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                else:
+                    await db.execute(
+                        update(OutboxMessage)
+                        .where(OutboxMessage.id.in_(sent_ids))
+                        .values(sent_at=func.now(), next_attempt_at=None)
+                        .execution_options(synchronize_session=False)
+                    )
+            # One statement per attempt count, as they share the same delay
+            for attempts, row_ids in retry_at.items():
+                delay = min(self._retry_delay * 2 ** (attempts - 1), self._max_retry_delay)
+                await db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(row_ids))
+                    .values(next_attempt_at=now + timedelta(seconds=delay))
+                    .execution_options(synchronize_session=False)
+                )
+            if parked:
+                await db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(parked))
+                    .values(failed_at=now, next_attempt_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+        if parked:
+            self._parked += len(parked)
+            logger.error(f"[LOG:CHASSIS:OUTBOX] - Parked {len(parked)} outbox rows after {self._max_attempts} attempts: ids={parked}")
+
+    def _publish(self, outgoing: List[_Outgoing]) -> Set[int]:
+        """Publish on the relay thread; returns the indexes that were not confirmed."""
+        try:
+            if self._publisher is None:
+                publisher = RabbitMQPublisher(
+                    queue="",
+                    rabbitmq_config=self._rabbitmq_config,
+                    declare_mode="none",
+                )
+                publisher._connect()
+                self._publisher = publisher
+            result = self._publisher._publish_confirmed(
+                outgoing,
+                mandatory=False,
+                window=self._batch_size,
+                timeout=self._confirm_timeout,
+            )
+        except Exception as e:
+            logger.warning(f"[LOG:CHASSIS:OUTBOX] - Failed to publish outbox batch: Reason={e}")
+            self._disconnect()
+            return set(range(len(outgoing)))
+        failed = set(result["nacked"]) | set(result["unconfirmed"])
+        if result["unconfirmed"]:
+            # The channel is likely gone; reconnect on the next batch
+            self._disconnect()
+        return failed
+
+    def _disconnect(self) -> None:
+        if self._publisher is not None:
+            try:
+                self._publisher._close()
+            except Exception:
+                pass
+            self._publisher = None
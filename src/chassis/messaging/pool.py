@@ -0,0 +1,194 @@
+from .client import (
+    build_connection_parameters,
+    config_key,
+)
+from .metrics import get_metrics
+from .types import RabbitMQConfig
+from pika import BlockingConnection
+from pika.adapters.blocking_connection import BlockingChannel
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import atexit
+import threading
+import time
+
+type _PoolKey = Tuple[Tuple[Any, ...], int]
+
+class _PooledConnection:
+    __slots__ = ("connection", "channel", "thread", "borrowed", "last_used", "last_checked")
+
+    def __init__(
+        self,
+        connection: BlockingConnection,
+        channel: BlockingChannel,
+        thread: threading.Thread,
+    ) -> None:
+        self.connection = connection
+        self.channel = channel
+        self.thread = thread
+        self.borrowed = 0
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+
+class RabbitMQConnectionPool:
+    """
+    Pool of BlockingConnections keyed by broker config and thread.
+
+    BlockingConnection is not thread-safe, so each thread gets its own
+    connection (and one long-lived channel on it) per broker. Borrowed
+    connections are checked before reuse (a short I/O pump surfaces dead
+    sockets), idle or orphaned ones are closed, and at most max_size
+    connections are open at the same time.
+    """
+    def __init__(
+        self,
+        max_size: int = 64,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        assert max_size > 0, "'max_size' must be positive."
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[_PoolKey, _PooledConnection] = {}
+        self._reserved = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "borrowed": sum(1 for entry in self._entries.values() if entry.borrowed),
+                "max_size": self._max_size,
+            }
+
+    def acquire(self, rabbitmq_config: RabbitMQConfig) -> Tuple[BlockingConnection, BlockingChannel]:
+        """
+        Borrow the calling thread's connection and channel for this broker,
+        connecting if needed. Pair every call with release().
+
+        Raises:
+            RuntimeError: If max_size connections are open and none is idle.
+        """
+        key = (config_key(rabbitmq_config), threading.get_ident())
+        stale: List[_PooledConnection] = []
+        with self._lock:
+            stale.extend(self._evict_locked())
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.borrowed += 1
+
+        if entry is not None and not self._is_healthy(entry):
+            with self._lock:
+                entry.borrowed -= 1
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            stale.append(entry)
+            entry = None
+        self._close_entries(stale)
+
+        if entry is None:
+            entry = self._open(key, rabbitmq_config)
+        entry.last_used = time.monotonic()
+        return entry.connection, entry.channel
+
+    def release(self, rabbitmq_config: RabbitMQConfig) -> None:
+        """Return the calling thread's connection; it stays open for reuse."""
+        key = (config_key(rabbitmq_config), threading.get_ident())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.borrowed > 0:
+                entry.borrowed -= 1
+                entry.last_used = time.monotonic()
+
+    def evict_idle(self) -> int:
+        """Close idle connections and those of finished threads now."""
+        with self._lock:
+            stale = self._evict_locked()
+        self._close_entries(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            stale = list(self._entries.values())
+            self._entries.clear()
+        self._close_entries(stale)
+
+    def _open(self, key: _PoolKey, rabbitmq_config: RabbitMQConfig) -> _PooledConnection:
+        stale: List[_PooledConnection] = []
+        with self._lock:
+            if len(self._entries) + self._reserved >= self._max_size:
+                # Make room by dropping the least recently used idle connection
+                idle = [(entry.last_used, k) for k, entry in self._entries.items() if not entry.borrowed]
+                if not idle:
+                    raise RuntimeError("RabbitMQ connection pool exhausted")
+                stale.append(self._entries.pop(min(idle)[1]))
+            self._reserved += 1
+        self._close_entries(stale)
+
+        try:
+            connection = BlockingConnection(build_connection_parameters(rabbitmq_config))
+            entry = _PooledConnection(connection, connection.channel(), threading.current_thread())
+        finally:
+            with self._lock:
+                self._reserved -= 1
+        entry.borrowed = 1
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        # Runs on the owning thread, so the connection can be used here
+        if not (entry.connection.is_open and entry.channel.is_open):
+            return False
+        now = time.monotonic()
+        if now - entry.last_checked < self._health_check_interval:
+            return True
+        try:
+            entry.connection.process_data_events(time_limit=0)
+        except Exception:
+            return False
+        entry.last_checked = now
+        return entry.connection.is_open and entry.channel.is_open
+
+    def _evict_locked(self) -> List[_PooledConnection]:
+        now = time.monotonic()
+        stale = [
+            key for key, entry in self._entries.items()
+            if not entry.borrowed and (
+                now - entry.last_used > self._idle_timeout
+                or not entry.thread.is_alive()
+            )
+        ]
+        return [self._entries.pop(key) for key in stale]
+
+    @staticmethod
+    def _close_entries(entries: List[_PooledConnection]) -> None:
+        for entry in entries:
+            try:
+                if entry.connection.is_open:
+                    entry.connection.close()
+            except Exception:
+                pass
+
+# Global Variables ############################################################
+_DEFAULT_POOL: Optional[RabbitMQConnectionPool] = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+# Functions ###################################################################
+def get_connection_pool() -> RabbitMQConnectionPool:
+    """Return the process-wide connection pool (created on first use)."""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = pool = RabbitMQConnectionPool()
+            atexit.register(pool.close)
+            get_metrics().register_source("connection_pool", lambda: pool.stats)
+        return _DEFAULT_POOL
@@ -1,14 +1,79 @@
 from .client import RabbitMQBaseClient
+from .compression import (
+    compress_body,
+    get_compressor,
+)
+from .metrics import (
+    get_metrics,
+    PUBLISHED_AT_HEADER,
+)
+from .pool import RabbitMQConnectionPool
+from .serializers import get_serializer
+from .spool import PublishSpool
 from .types import (
+    DeclareMode,
+    MessageType,
+    PublishManyResult,
     RabbitMQConfig,
-    MessageType
+    SpooledMessage,
+)
+from collections import OrderedDict
+from pika import (
+    BasicProperties,
+    BlockingConnection,
 )
-from pika import BasicProperties
-from typing import Optional
-import json
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.channel import Channel
+from pika.exceptions import (
+    AMQPError,
+    NackError,
+    UnroutableError,
+)
+from pika.frame import Method
+from pika.spec import Basic
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import logging
+import threading
+import time
+import uuid
+
+type _Outgoing = Tuple[str, str, bytes, BasicProperties]
+
+# Global Variables ############################################################
+logger = logging.getLogger(__name__)
+_DRAINER_LOCK = threading.Lock()
 
 class RabbitMQPublisher(RabbitMQBaseClient):
-    """RabbitMQ publisher with TLS support"""
+    """
+    RabbitMQ publisher with TLS support.
+
+    With compression set ("zlib" or "lzma"), bodies of at least
+    compression_threshold bytes are compressed and advertised through the
+    content_encoding property; RabbitMQListener decompresses them.
+
+    With a pool, the publisher borrows the calling thread's pooled connection
+    and channel instead of opening its own, and gives them back on close.
+
+    Declarations follow declare_mode (see RabbitMQBaseClient); with
+    queue="" no queue is declared or bound, messages only go to the
+    exchange. Use "none" once the topology is set up at startup.
+
+    With a spool, publish() and publish_batch() never raise because the
+    broker is unreachable: the message is appended to the spool instead
+    (and so is every message after it, to keep the order) and a background
+    thread replays the spool with publisher confirms once the broker is back.
+    """
+    _APPLY_QOS: bool = False
+    _DECLARE_UNNAMED_QUEUE: bool = False
+    _CONFIRM_POLL_INTERVAL: float = 0.005
+
     def __init__(
         self,
         queue: str,
@@ -17,6 +82,12 @@ class RabbitMQPublisher(RabbitMQBaseClient):
         exchange_type: str = "direct",
         routing_key: Optional[str] = None,
         auto_delete_queue: bool = False,
+        declare_mode: DeclareMode = "once",
+        content_type: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        pool: Optional[RabbitMQConnectionPool] = None,
+        spool: Optional[PublishSpool] = None,
     ) -> None:
         super().__init__(
             queue=queue, 
@@ -25,7 +96,29 @@ class RabbitMQPublisher(RabbitMQBaseClient):
             exchange_type=exchange_type,
             routing_key=routing_key,
             auto_delete_queue=auto_delete_queue,
+            declare_mode=declare_mode,
         )
+        # Default codec, overridable per message
+        self._content_type = content_type if content_type is not None else self._CONTENT_TYPE
+        get_serializer(self._content_type)
+        if compression is not None:
+            get_compressor(compression)
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._rabbitmq_config = rabbitmq_config
+        self._pool = pool
+        self._borrowed = False
+        self._spool = spool
+        if spool is not None and spool.depth > 0:
+            # Left over from a previous run
+            self._ensure_spool_drainer()
+
+        # Publisher confirms state (see publish_many)
+        self._confirm_channel: Optional[BlockingChannel] = None
+        self._next_delivery_tag = 1
+        self._pending_confirms: OrderedDict[int, int] = OrderedDict()
+        self._confirm_ids: Dict[str, int] = {}
+        self._confirm_result: Optional[PublishManyResult] = None
 
     def publish(
         self,
@@ -33,30 +126,32 @@ class RabbitMQPublisher(RabbitMQBaseClient):
         routing_key: Optional[str] = None,
         exchange: Optional[str] = None,
         persistent: bool = True,
+        content_type: Optional[str] = None,
+        message_id: Optional[str] = None,
     ) -> None:
         """
         Publish a message to RabbitMQ.
         
         Args:
             routing_key: Routing key (queue name for default exchange)
-            message: Message to publish (will be JSON serialized if dict/list)
+            message: Message to publish (serialized with the content type codec)
             exchange: Exchange name (uses instance default if None)
             persistent: Whether message should survive broker restart
+            content_type: Codec to use (uses instance default if None)
+            message_id: Id consumers deduplicate on (a random one if None)
         """
         assert isinstance(message, dict), "'message' must be a dictionary type."
-        if self._channel is None or self._connection is None or self._connection.is_closed:
-            try:
-                self._connect()
-            except Exception as e:
-                raise RuntimeError(f"Failed to reconnect to RabbitMQ: {e}")
 
-        # Serialize message
-        body = json.dumps(message)
+        # Serialize (and compress) message
+        body, target_content_type, content_encoding = self._encode(message, content_type)
 
         # Message properties
         properties = BasicProperties(
-            content_type=super()._CONTENT_TYPE,
+            content_type=target_content_type,
+            content_encoding=content_encoding,
             delivery_mode=2 if persistent else 1,
+            message_id=message_id or uuid.uuid4().hex,
+            headers={PUBLISHED_AT_HEADER: time.time()},
         )
 
         # Use instance defaults if not provided
@@ -64,14 +159,496 @@ class RabbitMQPublisher(RabbitMQBaseClient):
         target_routing_key = routing_key if routing_key is not None else self._routing_key
 
         # Publish message
-        assert self._channel is not None, "To publish, a channel must be created"
-        self._channel.basic_publish(
-            exchange=target_exchange,
-            routing_key=target_routing_key,
-            body=body,
-            properties=properties,
+        self._send(target_exchange, target_routing_key, body, properties)
+
+    def publish_batch(
+        self,
+        messages: List[MessageType],
+        routing_key: Optional[str] = None,
+        exchange: Optional[str] = None,
+        persistent: bool = True,
+        content_type: Optional[str] = None,
+        message_id: Optional[str] = None,
+    ) -> None:
+        """
+        Publish several messages as a single AMQP message holding an array.
+        
+        The batch is flagged with a header so RabbitMQListener unpacks it and
+        calls the consumer callback once per message.
+        
+        Args:
+            messages: Messages to pack (each must be a dictionary)
+            routing_key: Routing key (queue name for default exchange)
+            exchange: Exchange name (uses instance default if None)
+            persistent: Whether message should survive broker restart
+            content_type: Codec to use (uses instance default if None)
+            message_id: Id consumers deduplicate on (a random one if None)
+        """
+        assert all(isinstance(m, dict) for m in messages), "'messages' must only contain dictionaries."
+        if not messages:
+            return
+
+        body, target_content_type, content_encoding = self._encode(messages, content_type)
+        properties = BasicProperties(
+            content_type=target_content_type,
+            content_encoding=content_encoding,
+            delivery_mode=2 if persistent else 1,
+            message_id=message_id or uuid.uuid4().hex,
+            headers={
+                super()._BATCH_HEADER: len(messages),
+                PUBLISHED_AT_HEADER: time.time(),
+            },
+        )
+        self._send(
+            exchange if exchange is not None else self._exchange,
+            routing_key if routing_key is not None else self._routing_key,
+            body,
+            properties,
         )
 
+    def publish_many(
+        self,
+        messages: List[MessageType],
+        routing_key: Optional[str] = None,
+        exchange: Optional[str] = None,
+        persistent: bool = True,
+        mandatory: bool = True,
+        window: int = 1000,
+        timeout: float = 30.0,
+        content_type: Optional[str] = None,
+    ) -> PublishManyResult:
+        """
+        Publish a batch of messages with publisher confirms.
+        
+        Messages are streamed on a dedicated confirm-mode channel without waiting
+        for each ack; the broker acks are collected in windows of at most
+        `window` unconfirmed messages. If the installed pika does not expose
+        the channel this needs, messages are confirmed one at a time instead.
+        
+        Args:
+            messages: Messages to publish (each must be a dictionary)
+            routing_key: Routing key (queue name for default exchange)
+            exchange: Exchange name (uses instance default if None)
+            persistent: Whether messages should survive broker restart
+            mandatory: Ask the broker to return unroutable messages
+            window: Maximum number of unconfirmed messages in flight
+            timeout: Seconds to wait for all confirms before giving up
+            content_type: Codec to use (uses instance default if None)
+        
+        Returns:
+            Counts and input indexes of messages that were acked, nacked,
+            returned as unroutable, or left unconfirmed (timeout or failure).
+        """
+        assert all(isinstance(m, dict) for m in messages), "'messages' must only contain dictionaries."
+        assert window > 0, "'window' must be positive."
+        target_exchange = exchange if exchange is not None else self._exchange
+        target_routing_key = routing_key if routing_key is not None else self._routing_key
+        outgoing: List[_Outgoing] = []
+        for message in messages:
+            body, target_content_type, content_encoding = self._encode(message, content_type)
+            outgoing.append((
+                target_exchange,
+                target_routing_key,
+                body,
+                BasicProperties(
+                    content_type=target_content_type,
+                    content_encoding=content_encoding,
+                    delivery_mode=2 if persistent else 1,
+                    message_id=uuid.uuid4().hex,
+                    headers={PUBLISHED_AT_HEADER: time.time()},
+                ),
+            ))
+        return self._publish_confirmed(outgoing, mandatory, window, timeout)
+
+    def _publish_confirmed(
+        self,
+        outgoing: List[_Outgoing],
+        mandatory: bool,
+        window: int,
+        timeout: float,
+    ) -> PublishManyResult:
+        """Stream serialized messages on the confirm channel (see publish_many)."""
+        result: PublishManyResult = {
+            "published": 0,
+            "acked": 0,
+            "nacked": [],
+            "returned": [],
+            "unconfirmed": [],
+        }
+        if not outgoing:
+            return result
+
+        deadline = time.monotonic() + timeout
+        self._confirm_result = result
+        self._pending_confirms.clear()
+        self._confirm_ids.clear()
+        sent = 0
+        try:
+            channel = self._ensure_confirm_channel(deadline)
+            pipelined = _pipelining_channel(channel)
+            for index, (target_exchange, target_routing_key, body, properties) in enumerate(outgoing):
+                if pipelined is None:
+                    self._publish_blocking(channel, index, outgoing[index], mandatory, result)
+                    sent += 1
+                    continue
+                # Keep the pipeline full but bounded
+                if len(self._pending_confirms) >= window:
+                    self._wait_for_confirms(
+                        deadline, 
+                        lambda: len(self._pending_confirms) <= window // 2,
+                    )
+                    if len(self._pending_confirms) >= window:
+                        break
+
+                if properties.message_id is None:
+                    properties.message_id = uuid.uuid4().hex
+                self._pending_confirms[self._next_delivery_tag] = index
+                self._confirm_ids[properties.message_id] = index
+                self._next_delivery_tag += 1
+                pipelined.basic_publish(
+                    exchange=target_exchange,
+                    routing_key=target_routing_key,
+                    body=body,
+                    properties=properties,
+                    mandatory=mandatory,
+                )
+                sent += 1
+            self._wait_for_confirms(deadline, lambda: not self._pending_confirms)
+        except AMQPError:
+            # Channel or connection is gone: everything in flight is unknown
+            self._confirm_channel = None
+        finally:
+            result["published"] = sent
+            result["unconfirmed"] = sorted(self._pending_confirms.values()) + list(range(sent, len(outgoing)))
+            result["returned"].sort()
+            result["nacked"].sort()
+            self._pending_confirms.clear()
+            self._confirm_ids.clear()
+            self._confirm_result = None
+        return result
+
+    def _publish_blocking(
+        self,
+        channel: BlockingChannel,
+        index: int,
+        message: _Outgoing,
+        mandatory: bool,
+        result: PublishManyResult,
+    ) -> None:
+        """Publish one message on a blocking confirm channel and record its outcome."""
+        target_exchange, target_routing_key, body, properties = message
+        try:
+            channel.basic_publish(
+                exchange=target_exchange,
+                routing_key=target_routing_key,
+                body=body,
+                properties=properties,
+                mandatory=mandatory,
+            )
+        except UnroutableError:
+            result["returned"].append(index)
+        except NackError:
+            result["nacked"].append(index)
+        else:
+            result["acked"] += 1
+
+    def _send(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: BasicProperties,
+    ) -> None:
+        """Publish one serialized message and record its latency."""
+        started = time.perf_counter()
+        try:
+            self._deliver(exchange, routing_key, body, properties)
+        except Exception:
+            get_metrics().observe_publish(exchange, routing_key, time.perf_counter() - started, False)
+            raise
+        get_metrics().observe_publish(exchange, routing_key, time.perf_counter() - started, True)
+
+    def _deliver(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: BasicProperties,
+    ) -> None:
+        """Publish one serialized message, falling back to the spool if there is one."""
+        # Messages still waiting in the spool go first, and while the broker
+        # is known to be down there is no point waiting for a connection
+        if self._spool is not None and (self._spool.depth > 0 or self._spool.broker_down):
+            self._spool_message(exchange, routing_key, body, properties)
+            return
+        try:
+            if self._needs_connect():
+                try:
+                    self._connect()
+                except Exception as e:
+                    raise RuntimeError(f"Failed to reconnect to RabbitMQ: {e}")
+            assert self._channel is not None, "To publish, a channel must be created"
+            self._channel.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=properties,
+            )
+        except (RuntimeError, AMQPError):
+            if self._spool is None:
+                raise
+            # Later publishes skip the connection attempt until the drainer gets through
+            self._spool.broker_down = True
+            self._spool_message(exchange, routing_key, body, properties)
+
+    def _spool_message(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: BasicProperties,
+    ) -> None:
+        assert self._spool is not None, "Spooling requires a spool"
+        spooled: SpooledMessage = {
+            "exchange": exchange,
+            "routing_key": routing_key,
+            "body": body,
+            "content_type": properties.content_type,
+            "content_encoding": properties.content_encoding,
+            "delivery_mode": properties.delivery_mode,
+            "message_id": properties.message_id,
+            "headers": properties.headers,
+        }
+        if not self._spool.append(spooled):
+            raise RuntimeError("RabbitMQ is unreachable and the publish spool is full")
+        self._ensure_spool_drainer()
+
+    def _ensure_spool_drainer(self) -> None:
+        """Start the spool's replay thread unless it is running already."""
+        assert self._spool is not None, "Draining requires a spool"
+        with _DRAINER_LOCK:
+            if self._spool.drainer is not None and self._spool.drainer.is_alive():
+                return
+            self._spool.drainer = threading.Thread(
+                target=_drain_spool,
+                args=(self._spool, self._rabbitmq_config),
+                name="chassis-publish-spool",
+                daemon=True,
+            )
+            self._spool.drainer.start()
+
+    def _connect(self, connection: Optional[BlockingConnection] = None) -> None:
+        """Connect, or borrow the thread's connection and channel from the pool."""
+        if self._pool is None or connection is not None:
+            super()._connect(connection)
+            return
+        if self._borrowed:
+            self._pool.release(self._rabbitmq_config)
+            self._borrowed = False
+        self._connection, self._channel = self._pool.acquire(self._rabbitmq_config)
+        self._borrowed = True
+        self._owns_connection = False
+        self._setup_channel()
+
+    def _needs_connect(self) -> bool:
+        if self._channel is None or self._connection is None or self._connection.is_closed:
+            return True
+        # A pooled channel closed by a channel error is replaced by the pool
+        return self._borrowed and self._channel.is_closed
+
+    def _close(self) -> None:
+        """Close (or give back to the pool) the connection and the confirm channel."""
+        if self._confirm_channel is not None and self._confirm_channel.is_open:
+            try:
+                self._confirm_channel.close()
+            except Exception:
+                pass
+        self._confirm_channel = None
+        if not self._borrowed:
+            super()._close()
+            return
+        assert self._pool is not None, "Borrowed connections come from a pool"
+        self._pool.release(self._rabbitmq_config)
+        self._borrowed = False
+        self._connection = None
+        self._channel = None
+
+    def _encode(
+        self,
+        payload: Any,
+        content_type: Optional[str],
+    ) -> Tuple[bytes, str, Optional[str]]:
+        """Serialize payload; return body, content_type and content_encoding."""
+        serializer = get_serializer(content_type or self._content_type)
+        body, content_encoding = compress_body(
+            serializer.dumps(payload),
+            self._compression,
+            self._compression_threshold,
+        )
+        return body, serializer.content_type, content_encoding
+
+    def _ensure_confirm_channel(self, deadline: float) -> BlockingChannel:
+        """Open (once) a dedicated channel in confirm mode."""
+        if self._confirm_channel is not None and self._confirm_channel.is_open:
+            return self._confirm_channel
+        if self._needs_connect():
+            try:
+                self._connect()
+            except Exception as e:
+                raise RuntimeError(f"Failed to reconnect to RabbitMQ: {e}")
+        assert self._connection is not None, "To publish, a connection must be created"
+
+        channel = self._connection.channel()
+        pipelined = _pipelining_channel(channel)
+        if pipelined is None:
+            logger.warning("[LOG:CHASSIS:RABBITMQ_PUBLISHER] - Pipelined confirms are unavailable with this pika version; confirming one message at a time")
+            channel.confirm_delivery()
+        else:
+            selected: List[Method] = []
+            pipelined.add_on_return_callback(self._on_message_returned)
+            pipelined.confirm_delivery(
+                ack_nack_callback=self._on_delivery_confirmation,
+                callback=selected.append,
+            )
+            self._wait_for_confirms(deadline, lambda: bool(selected))
+            if not selected:
+                raise RuntimeError("Timed out enabling publisher confirms")
+        self._confirm_channel = channel
+        self._next_delivery_tag = 1
+        return channel
+
+    def _wait_for_confirms(
+        self,
+        deadline: float,
+        until: Callable[[], bool],
+    ) -> None:
+        """Pump connection I/O until the condition holds or the deadline passes."""
+        assert self._connection is not None, "A connection is required to wait for confirms"
+        while not until():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._connection.process_data_events(
+                time_limit=min(remaining, self._CONFIRM_POLL_INTERVAL)
+            )
+
+    def _on_delivery_confirmation(self, frame: Method) -> None:
+        """Basic.Ack / Basic.Nack from the broker, possibly covering many tags."""
+        result = self._confirm_result
+        delivery_tag = frame.method.delivery_tag
+        if frame.method.multiple:
+            indexes = []
+            while self._pending_confirms and next(iter(self._pending_confirms)) <= delivery_tag:
+                indexes.append(self._pending_confirms.popitem(last=False)[1])
+        else:
+            index = self._pending_confirms.pop(delivery_tag, None)
+            indexes = [index] if index is not None else []
+        if result is None:
+            return
+        if isinstance(frame.method, Basic.Nack):
+            result["nacked"].extend(indexes)
+        else:
+            returned = set(result["returned"])
+            result["acked"] += sum(1 for index in indexes if index not in returned)
+
+    def _on_message_returned(
+        self,
+        channel: object,
+        method: Basic.Return,
+        properties: BasicProperties,
+        body: bytes,
+    ) -> None:
+        """Basic.Return for an unroutable mandatory message (sent before its ack)."""
+        result = self._confirm_result
+        if result is None or properties.message_id is None:
+            return
+        index = self._confirm_ids.get(properties.message_id)
+        if index is not None:
+            result["returned"].append(index)
+
+def _pipelining_channel(channel: BlockingChannel) -> Optional[Channel]:
+    """
+    The asynchronous pika Channel wrapped by a BlockingChannel, or None.
+
+    In confirm mode, BlockingChannel.basic_publish waits for the ack of every
+    message, so pipelined confirms publish on the wrapped Channel instead.
+    It is the private _impl attribute in pika 1.3.2 (the pinned version);
+    None makes publish_many fall back to one blocking publish per message.
+    """
+    impl = getattr(channel, "_impl", None)
+    if not isinstance(impl, Channel):
+        return None
+    return impl
+
+def _drain_spool(
+    spool: PublishSpool,
+    rabbitmq_config: RabbitMQConfig,
+    batch_size: int = 500,
+    confirm_timeout: float = 30.0,
+    retry_delay: float = 0.5,
+    max_retry_delay: float = 30.0,
+) -> None:
+    """
+    Replay the spool in order over a dedicated connection, in batches with
+    publisher confirms. The cursor only moves past confirmed records, so a
+    failure replays the rest of the batch (at-least-once).
+    """
+    publisher: Optional[RabbitMQPublisher] = None
+    delay = retry_delay
+    while not spool.closed:
+        if not spool.wait(timeout=1.0):
+            continue
+        records = spool.peek(batch_size)
+        if not records:
+            continue
+        result: Optional[PublishManyResult] = None
+        try:
+            if publisher is None:
+                publisher = RabbitMQPublisher(
+                    queue="",
+                    rabbitmq_config=rabbitmq_config,
+                    declare_mode="none",
+                )
+                publisher._connect()
+            outgoing: List[_Outgoing] = [
+                (
+                    message["exchange"],
+                    message["routing_key"],
+                    message["body"],
+                    BasicProperties(
+                        content_type=message["content_type"],
+                        content_encoding=message["content_encoding"],
+                        delivery_mode=message["delivery_mode"],
+                        message_id=message["message_id"],
+                        headers=message["headers"],
+                    ),
+                )
+                for _, message in records
+            ]
+            result = publisher._publish_confirmed(outgoing, mandatory=False, window=batch_size, timeout=confirm_timeout)
+        except Exception as e:
+            logger.warning(f"[LOG:CHASSIS:RABBITMQ_PUBLISHER] - Spool replay failed, retrying in {delay}s: Reason={e}")
+
+        # Publishers fail fast into the spool while nothing gets through
+        spool.broker_down = result is None or bool(result["unconfirmed"])
+        # Commit the confirmed prefix; the rest is replayed after a pause
+        failed = sorted(result["nacked"] + result["unconfirmed"]) if result is not None else [0]
+        done = failed[0] if failed else len(records)
+        if done:
+            spool.commit(records[done - 1][0], done)
+            delay = retry_delay
+        if failed:
+            if publisher is not None:
+                try:
+                    publisher._close()
+                except Exception:
+                    pass
+                publisher = None
+            time.sleep(delay)
+            delay = min(delay * 2, max_retry_delay)
+    if publisher is not None:
+        publisher._close()
+
 #### Examples
 # # Default exchange (no binding)
 # publisher = RabbitMQPublisher(
@@ -0,0 +1,95 @@
+from .types import RetryPolicy
+from pika import BasicProperties
+from pika.adapters.blocking_connection import BlockingChannel
+from typing import (
+    Any,
+    Dict,
+    List,
+    LiteralString,
+)
+
+class RetryTopology:
+    """
+    Delayed retries for one queue, without blocking the consumer.
+
+    A failed message is republished to a retry queue whose TTL is the
+    backoff delay of its attempt; when the TTL expires the broker
+    dead-letters it through the default exchange back to the main queue.
+    Each backoff tier (base_delay * multiplier ** (attempt - 1), capped at
+    max_delay) has its own queue, so one TTL applies per queue. After
+    max_attempts failed attempts the message is parked in "<queue>.dlq".
+
+    The attempt count, last error and original routing key travel in
+    headers. The original delivery is acked once it was republished, so a
+    crash in between may deliver it twice (at-least-once).
+    """
+    ATTEMPT_HEADER: LiteralString = "x-chassis-attempt"
+    ERROR_HEADER: LiteralString = "x-chassis-error"
+    ROUTING_KEY_HEADER: LiteralString = "x-chassis-routing-key"
+    _MAX_ERROR_LENGTH: int = 512
+
+    def __init__(
+        self,
+        queue: str,
+        policy: RetryPolicy,
+    ) -> None:
+        self._queue = queue
+        self._max_attempts = policy.get("max_attempts", 5)
+        base_delay = policy.get("base_delay", 1.0)
+        multiplier = policy.get("multiplier", 2.0)
+        max_delay = policy.get("max_delay", 300.0)
+        assert self._max_attempts > 0, "'max_attempts' must be positive."
+        # Delay (ms) before attempt n + 2, for every retry that can happen
+        self._delays: List[int] = [
+            int(min(base_delay * multiplier ** attempt, max_delay) * 1000)
+            for attempt in range(self._max_attempts - 1)
+        ]
+        self.dead_letter_queue = f"{queue}.dlq"
+
+    def retry_queue(self, delay_ms: int) -> str:
+        return f"{self._queue}.retry.{delay_ms}"
+
+    def queues(self) -> Dict[str, Dict[str, Any]]:
+        """Arguments of the dead-letter queue and of one queue per backoff tier."""
+        queues: Dict[str, Dict[str, Any]] = {self.dead_letter_queue: {}}
+        for delay_ms in sorted(set(self._delays)):
+            queues[self.retry_queue(delay_ms)] = {
+                "x-message-ttl": delay_ms,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": self._queue,
+            }
+        return queues
+
+    def republish(
+        self,
+        channel: BlockingChannel,
+        routing_key: str,
+        properties: BasicProperties,
+        body: bytes,
+        error: BaseException,
+    ) -> str:
+        """Send a failed delivery to its retry tier or the DLQ; returns the target queue."""
+        headers = dict(properties.headers or {})
+        attempt = int(headers.get(self.ATTEMPT_HEADER, 0)) + 1
+        headers[self.ATTEMPT_HEADER] = attempt
+        headers[self.ERROR_HEADER] = f"{type(error).__name__}: {error}"[:self._MAX_ERROR_LENGTH]
+        headers.setdefault(self.ROUTING_KEY_HEADER, routing_key)
+        target = (
+            self.dead_letter_queue if attempt >= self._max_attempts
+            else self.retry_queue(self._delays[attempt - 1])
+        )
+        channel.basic_publish(
+            exchange="",
+            routing_key=target,
+            body=body,
+            properties=BasicProperties(
+                content_type=properties.content_type,
+                content_encoding=properties.content_encoding,
+                delivery_mode=properties.delivery_mode,
+                message_id=properties.message_id,
+                correlation_id=properties.correlation_id,
+                timestamp=properties.timestamp,
+                headers=headers,
+            ),
+        )
+        return target
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Generic,
+    List,
+    Set,
+    Tuple,
+    TypeVar,
+)
+import threading
+
+T = TypeVar("T")
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node[T]] = {}
+        # (registration order, value) of every value of the pattern ending here
+        self.entries: List[Tuple[int, T]] = []
+
+class RoutingTrie(Generic[T]):
+    """
+    Routing-key patterns compiled into a trie of dot-separated words.
+
+    Patterns follow topic exchange rules: "*" matches exactly one word and
+    "#" matches zero or more words. A pattern can hold several values.
+    match() returns the values of every matching pattern in registration
+    order (each value once); results are memoized per routing key (up to
+    cache_size keys), so repeated keys cost one dict lookup whatever the
+    number of patterns.
+    """
+    def __init__(self, cache_size: int = 4096) -> None:
+        assert cache_size > 0, "'cache_size' must be positive."
+        self._root: _Node[T] = _Node()
+        self._patterns: Dict[str, List[T]] = {}
+        self._count = 0
+        self._cache: OrderedDict[str, Tuple[T, ...]] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def patterns(self) -> List[str]:
+        return list(self._patterns)
+
+    @property
+    def values(self) -> List[T]:
+        """Every registered value, once, in registration order."""
+        unique: Dict[int, T] = {}
+        for values in self._patterns.values():
+            for value in values:
+                unique.setdefault(id(value), value)
+        return list(unique.values())
+
+    def add(self, pattern: str, value: T) -> None:
+        """Register value for pattern, next to the values it already has."""
+        with self._lock:
+            values = self._patterns.setdefault(pattern, [])
+            if any(existing is value for existing in values):
+                return
+            node = self._root
+            for word in pattern.split("."):
+                node = node.children.setdefault(word, _Node())
+            values.append(value)
+            node.entries.append((self._count, value))
+            self._count += 1
+            self._cache.clear()
+
+    def match(self, routing_key: str) -> Tuple[T, ...]:
+        with self._lock:
+            values = self._cache.get(routing_key)
+            if values is not None:
+                self._cache.move_to_end(routing_key)
+                return values
+            entries: Dict[int, T] = {}
+            self._collect(self._root, routing_key.split("."), 0, entries, set())
+            # A value registered under several matching patterns is returned once
+            unique: Dict[int, T] = {}
+            for order in sorted(entries):
+                unique.setdefault(id(entries[order]), entries[order])
+            values = tuple(unique.values())
+            self._cache[routing_key] = values
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return values
+
+    def _collect(
+        self,
+        node: _Node[T],
+        words: List[str],
+        index: int,
+        entries: Dict[int, T],
+        visited: Set[Tuple[int, int]],
+    ) -> None:
+        # (node, position) pairs reached through several "#" expansions are walked once
+        state = (id(node), index)
+        if state in visited:
+            return
+        visited.add(state)
+        if index == len(words):
+            for order, value in node.entries:
+                entries[order] = value
+            hash_node = node.children.get("#")
+            if hash_node is not None:
+                self._collect(hash_node, words, index, entries, visited)
+            return
+        for key in (words[index], "*"):
+            child = node.children.get(key)
+            if child is not None:
+                self._collect(child, words, index + 1, entries, visited)
+        hash_node = node.children.get("#")
+        if hash_node is not None:
+            # "#" swallows zero or more of the remaining words
+            for end in range(index, len(words) + 1):
+                self._collect(hash_node, words, end, entries, visited)
@@ -0,0 +1,92 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    LiteralString,
+)
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_CONTENT_TYPE: LiteralString = "application/json"
+MSGPACK_CONTENT_TYPE: LiteralString = "application/msgpack"
+
+class Serializer:
+    """Codec for one AMQP content_type; encodes to and decodes from bytes."""
+    __slots__ = ("content_type", "dumps", "loads")
+
+    def __init__(
+        self,
+        content_type: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ) -> None:
+        self.content_type = content_type
+        self.dumps = dumps
+        self.loads = loads
+
+# Global Variables ############################################################
+_SERIALIZERS: Dict[str, Serializer] = {}
+
+# Functions ###################################################################
+def register_serializer(serializer: Serializer, *aliases: str) -> None:
+    """Register a codec for its content_type (and optional aliases)."""
+    for content_type in (serializer.content_type, *aliases):
+        _SERIALIZERS[content_type] = serializer
+
+def get_serializer(content_type: str) -> Serializer:
+    """Return the codec for a content_type, ignoring parameters such as charset."""
+    serializer = _SERIALIZERS.get(content_type)
+    if serializer is None:
+        serializer = _SERIALIZERS.get(content_type.split(";", 1)[0].strip().lower())
+        if serializer is None:
+            raise ValueError(f"No serializer registered for content type: {content_type}")
+    return serializer
+
+def available_content_types() -> List[str]:
+    return sorted(_SERIALIZERS)
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode()
+
+def _orjson_dumps(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers beyond 64 bits
+        return _stdlib_json_dumps(obj)
+
+def use_orjson() -> None:
+    """
+    Encode and decode JSON with orjson (the "fast" extra) instead of the
+    stdlib. Opt-in because orjson is stricter: NaN and Infinity are
+    published as null, while the stdlib writes them as-is. Non-str dict
+    keys are accepted, and objects orjson cannot encode (such as integers
+    beyond 64 bits) fall back to the stdlib.
+    """
+    if orjson is None:
+        raise RuntimeError("orjson is not installed; install the 'fast' extra")
+    register_serializer(Serializer(JSON_CONTENT_TYPE, _orjson_dumps, orjson.loads))
+
+# JSON: stdlib by default, same output as json.dumps (see use_orjson).
+# json.loads accepts bytes, although it decodes them to a str internally.
+register_serializer(Serializer(JSON_CONTENT_TYPE, _stdlib_json_dumps, json.loads))
+
+if msgpack is not None:
+    register_serializer(
+        Serializer(
+            MSGPACK_CONTENT_TYPE,
+            lambda obj: msgpack.packb(obj, use_bin_type=True),
+            lambda body: msgpack.unpackb(body, raw=False),
+        ),
+        "application/x-msgpack",
+    )
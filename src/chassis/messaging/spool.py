@@ -0,0 +1,266 @@
+from .metrics import get_metrics
+from .types import SpooledMessage
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+type SpoolPosition = Tuple[int, int]
+
+class PublishSpool:
+    """
+    Append-only, memory-mapped segment log of messages waiting to be published.
+
+    Segments are preallocated files of segment_size bytes, written through a
+    memory map. Each record is a (length, crc32) header followed by a small
+    JSON metadata block and the message body; a zeroed header marks the end
+    of the written part. A cursor file records how far the log was replayed,
+    and fully replayed segments are deleted. Records written before a crash
+    of the process are recovered on the next start (an OS crash may lose
+    records that were not flushed yet).
+
+    The spool stops accepting records once its segments would take more than
+    max_bytes on disk.
+    """
+    _HEADER = struct.Struct("<II")
+    _META_LENGTH = struct.Struct("<I")
+    _CURSOR = struct.Struct("<QQ")
+    _SEGMENT_SUFFIX: str = ".seg"
+    _CURSOR_FILE: str = "cursor"
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 1024 * 1024 * 1024,
+        segment_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        assert segment_size > self._HEADER.size, "'segment_size' is too small."
+        assert max_bytes >= segment_size, "'max_bytes' must hold at least one segment."
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._segment_size = segment_size
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._sizes: Dict[int, int] = {}
+        self._closed = False
+        self.drainer: Optional[threading.Thread] = None
+        # Set while the broker is known to be unreachable, so publishers spool
+        # right away instead of trying to connect; cleared by a successful replay
+        self.broker_down = False
+
+        # Counters
+        self._depth = 0
+        self._spooled = 0
+        self._replayed = 0
+        self._rejected = 0
+
+        self._recover()
+        get_metrics().register_source(self._metrics_name, lambda: self.stats)
+
+    @property
+    def _metrics_name(self) -> str:
+        return f"spool:{self._directory}"
+
+    @property
+    def depth(self) -> int:
+        """Number of records waiting to be replayed."""
+        return self._depth
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the spool counters."""
+        with self._lock:
+            return {
+                "depth": self._depth,
+                "bytes": sum(self._sizes.values()),
+                "segments": len(self._sizes),
+                "spooled": self._spooled,
+                "replayed": self._replayed,
+                "rejected": self._rejected,
+            }
+
+    def append(self, message: SpooledMessage) -> bool:
+        """Append a record. Returns False when the spool is full or closed."""
+        meta = json.dumps({key: value for key, value in message.items() if key != "body"}).encode()
+        payload = self._META_LENGTH.pack(len(meta)) + meta + message["body"]
+        record_size = self._HEADER.size + len(payload)
+        with self._lock:
+            if self._closed:
+                self._rejected += 1
+                return False
+            # Room for the record and the end marker that follows it
+            if self._write_offset + record_size + self._HEADER.size > self._sizes[self._write_seq]:
+                if not self._open_segment(self._write_seq + 1, record_size + self._HEADER.size):
+                    self._rejected += 1
+                    return False
+            segment = self._maps[self._write_seq]
+            offset = self._write_offset
+            segment[offset + self._HEADER.size:offset + record_size] = payload
+            # Header last, so a torn write is never read as a record
+            segment[offset:offset + self._HEADER.size] = self._HEADER.pack(len(payload), zlib.crc32(payload))
+            self._write_offset += record_size
+            self._depth += 1
+            self._spooled += 1
+            self._not_empty.notify_all()
+        return True
+
+    def peek(self, max_records: int) -> List[Tuple[SpoolPosition, SpooledMessage]]:
+        """Read up to max_records records from the cursor, with the position after each."""
+        records: List[Tuple[SpoolPosition, SpooledMessage]] = []
+        with self._lock:
+            seq, offset = self._cursor
+            while len(records) < max_records:
+                record = self._read(seq, offset)
+                if record is None:
+                    if seq >= self._write_seq:
+                        break
+                    seq, offset = seq + 1, 0
+                    continue
+                offset, message = record
+                records.append(((seq, offset), message))
+        return records
+
+    def commit(self, position: SpoolPosition, count: int) -> None:
+        """Move the cursor past count replayed records and drop finished segments."""
+        with self._lock:
+            self._cursor = position
+            self._depth = max(0, self._depth - count)
+            self._replayed += count
+            self._write_cursor()
+            for seq in [seq for seq in self._maps if seq < position[0]]:
+                self._drop_segment(seq)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait until records are pending; returns whether there are any."""
+        with self._not_empty:
+            if self._depth == 0 and not self._closed:
+                self._not_empty.wait(timeout)
+            return self._depth > 0
+
+    def flush(self) -> None:
+        """Write the active segment back to disk."""
+        with self._lock:
+            segment = self._maps.get(self._write_seq)
+            if segment is not None:
+                segment.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for segment in self._maps.values():
+                segment.flush()
+                segment.close()
+            self._maps.clear()
+            self._not_empty.notify_all()
+        get_metrics().unregister_source(self._metrics_name)
+
+    def _segment_path(self, seq: int) -> Path:
+        return self._directory / f"{seq:012d}{self._SEGMENT_SUFFIX}"
+
+    def _open_segment(self, seq: int, min_size: int) -> bool:
+        """Create (preallocate and map) a new segment; False if over max_bytes."""
+        size = max(self._segment_size, min_size)
+        if sum(self._sizes.values()) + size > self._max_bytes:
+            return False
+        if self._write_seq in self._maps:
+            self._maps[self._write_seq].flush()
+        with open(self._segment_path(seq), "w+b") as file:
+            file.truncate(size)
+            self._maps[seq] = mmap.mmap(file.fileno(), size)
+        self._sizes[seq] = size
+        self._write_seq, self._write_offset = seq, 0
+        return True
+
+    def _map_segment(self, seq: int) -> None:
+        with open(self._segment_path(seq), "r+b") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._maps[seq] = mmap.mmap(file.fileno(), size)
+        self._sizes[seq] = size
+
+    def _drop_segment(self, seq: int) -> None:
+        self._maps.pop(seq).close()
+        del self._sizes[seq]
+        self._segment_path(seq).unlink(missing_ok=True)
+
+    def _read(self, seq: int, offset: int) -> Optional[Tuple[int, SpooledMessage]]:
+        """Record at (seq, offset) and the offset after it; None at the end of the segment."""
+        segment = self._maps.get(seq)
+        if segment is None or offset + self._HEADER.size > len(segment):
+            return None
+        length, checksum = self._HEADER.unpack_from(segment, offset)
+        start, end = offset + self._HEADER.size, offset + self._HEADER.size + length
+        if length == 0 or end > len(segment):
+            return None
+        payload = segment[start:end]
+        if zlib.crc32(payload) != checksum:
+            return None
+        (meta_length,) = self._META_LENGTH.unpack_from(payload)
+        meta_end = self._META_LENGTH.size + meta_length
+        message: SpooledMessage = json.loads(payload[self._META_LENGTH.size:meta_end])
+        message["body"] = payload[meta_end:]
+        return end, message
+
+    def _write_cursor(self) -> None:
+        path = self._directory / self._CURSOR_FILE
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(self._CURSOR.pack(*self._cursor))
+        os.replace(temporary, path)
+
+    def _recover(self) -> None:
+        """Map existing segments, restore the cursor and find the write position."""
+        seqs = sorted(
+            int(path.stem) for path in self._directory.glob(f"*{self._SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+        cursor_path = self._directory / self._CURSOR_FILE
+        cursor: SpoolPosition = (seqs[0] if seqs else 0, 0)
+        if cursor_path.exists():
+            data = cursor_path.read_bytes()
+            if len(data) == self._CURSOR.size:
+                cursor = self._CURSOR.unpack(data)
+
+        # Segments before the cursor were replayed already
+        for seq in seqs:
+            if seq < cursor[0]:
+                self._segment_path(seq).unlink(missing_ok=True)
+            else:
+                self._map_segment(seq)
+        reset = cursor[0] not in self._maps
+        if reset:
+            # The cursor's segment is gone, and the log restarts at its beginning
+            cursor = (min(self._maps), 0) if self._maps else (cursor[0], 0)
+        self._cursor = cursor
+        if reset:
+            self._write_cursor()
+        self._write_seq, self._write_offset = cursor[0], cursor[1]
+
+        # Count pending records up to the first gap (end of the written log)
+        seq, offset = cursor
+        while seq in self._maps:
+            record = self._read(seq, offset)
+            if record is None:
+                self._write_seq, self._write_offset = seq, offset
+                seq, offset = seq + 1, 0
+                continue
+            offset = record[0]
+            self._depth += 1
+
+        if self._write_seq not in self._maps:
+            self._open_segment(self._write_seq, 0)
@@ -0,0 +1,199 @@
+from .types import RabbitMQConfig
+from .utils import (
+    _QUEUE_HANDLERS,
+    _QUEUE_SETTINGS,
+    start_all_listeners,
+)
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+# Global Variables ############################################################
+logger = logging.getLogger(__name__)
+
+class _WorkerSlot:
+    __slots__ = ("process", "started_at", "failures", "restart_at")
+
+    def __init__(self) -> None:
+        self.process: Optional[BaseProcess] = None
+        self.started_at = 0.0
+        self.failures = 0
+        self.restart_at = 0.0
+
+class ConsumerSupervisor:
+    """
+    Runs the registered queue handlers in several forked worker processes,
+    so CPU-bound handlers can use more than one core.
+
+    Each worker opens its own connection and consumes every queue (see
+    start_all_listeners) with the prefetch count divided among the workers.
+    A worker that exits while the supervisor is running is restarted after
+    restart_backoff seconds, doubled for each consecutive failure (up to
+    max_backoff); a worker that stayed up for stable_after seconds starts
+    over from restart_backoff.
+
+    On SIGTERM or SIGINT the workers are asked to drain: they stop
+    consuming, let in-flight handlers finish and settle their deliveries
+    (the signal only sets a flag, so a running handler is never
+    interrupted). Workers still running after drain_timeout seconds are
+    killed.
+
+    Workers are forked, so handlers must be registered before run() and
+    the supervisor process should not open broker connections itself.
+    """
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        workers: Optional[int] = None,
+        queues: Optional[List[str]] = None,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None,
+        restart_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        stable_after: float = 60.0,
+        drain_timeout: float = 30.0,
+    ) -> None:
+        self._workers = workers or os.cpu_count() or 1
+        assert self._workers > 0, "'workers' must be positive."
+        self._rabbitmq_config = rabbitmq_config
+        self._queues = queues
+        self._concurrent = concurrent
+        self._max_workers = max_workers
+        self._restart_backoff = restart_backoff
+        self._max_backoff = max_backoff
+        self._stable_after = stable_after
+        self._drain_timeout = drain_timeout
+        self._context = multiprocessing.get_context("fork")
+        self._slots = [_WorkerSlot() for _ in range(self._workers)]
+        self._stopping = False
+
+        # Counters
+        self._restarts = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._workers,
+            "alive": sum(1 for slot in self._slots if slot.process is not None and slot.process.is_alive()),
+            "restarts": self._restarts,
+        }
+
+    def run(self) -> None:
+        """Start the workers and supervise them until SIGTERM/SIGINT or stop()."""
+        previous = {
+            signum: signal.signal(signum, self._on_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            logger.info(f"[LOG:CHASSIS:RABBITMQ_SUPERVISOR] - Starting {self._workers} consumer workers")
+            while not self._stopping:
+                now = time.monotonic()
+                for index, slot in enumerate(self._slots):
+                    self._check(index, slot, now)
+                sentinels = [slot.process.sentinel for slot in self._slots if slot.process is not None]
+                # Wake up when a worker exits, or in time for pending restarts
+                wait(sentinels, timeout=self._next_wakeup(now))
+        finally:
+            self._drain()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def stop(self) -> None:
+        """Ask run() to drain the workers and return."""
+        self._stopping = True
+
+    def _on_signal(self, signum: int, frame: Any) -> None:
+        logger.info(f"[LOG:CHASSIS:RABBITMQ_SUPERVISOR] - Received {signal.Signals(signum).name}, draining workers")
+        self.stop()
+
+    def _check(self, index: int, slot: _WorkerSlot, now: float) -> None:
+        process = slot.process
+        if process is not None:
+            if process.is_alive():
+                return
+            uptime = now - slot.started_at
+            slot.failures = 1 if uptime >= self._stable_after else slot.failures + 1
+            backoff = min(self._restart_backoff * 2 ** (slot.failures - 1), self._max_backoff)
+            slot.restart_at = now + backoff
+            logger.warning(
+                f"[LOG:CHASSIS:RABBITMQ_SUPERVISOR] - Worker {index} exited (code {process.exitcode}) "
+                f"after {uptime:.1f}s, restarting in {backoff:.1f}s"
+            )
+            slot.process = None
+            process.close()
+            return
+        if now < slot.restart_at:
+            return
+        if slot.started_at:
+            self._restarts += 1
+        slot.process = self._context.Process(
+            target=_run_worker,
+            args=(self._rabbitmq_config, self._workers, self._queues, self._concurrent, self._max_workers),
+            name=f"chassis-consumer-{index}",
+        )
+        slot.process.start()
+        slot.started_at = now
+
+    def _next_wakeup(self, now: float) -> float:
+        pending = [slot.restart_at - now for slot in self._slots if slot.process is None]
+        return max(0.0, min(pending, default=1.0))
+
+    def _drain(self) -> None:
+        processes = [slot.process for slot in self._slots if slot.process is not None]
+        for process in processes:
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self._drain_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"[LOG:CHASSIS:RABBITMQ_SUPERVISOR] - Worker {process.name} did not drain in time, killing it")
+                process.kill()
+                process.join()
+        for slot in self._slots:
+            slot.process = None
+        logger.info("[LOG:CHASSIS:RABBITMQ_SUPERVISOR] - Consumer workers stopped")
+
+# Functions ###################################################################
+def _run_worker(
+    rabbitmq_config: RabbitMQConfig,
+    workers: int,
+    queues: Optional[List[str]],
+    concurrent: bool,
+    max_workers: Optional[int],
+) -> None:
+    """Worker process entry point: consume with a share of the prefetch count."""
+    # SIGTERM and SIGINT only request the drain; start_all_listeners cancels
+    # the consumers from the connection thread once the running handler returns
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    config: RabbitMQConfig = {
+        **rabbitmq_config,
+        "prefetch_count": math.ceil(rabbitmq_config["prefetch_count"] / workers),
+    }
+    # The settings are this process' copy (forked), so they can be changed freely
+    for queue in list(_QUEUE_HANDLERS) if queues is None else queues:
+        settings = _QUEUE_SETTINGS.get(queue)
+        if settings is not None and "prefetch_count" in settings:
+            settings["prefetch_count"] = math.ceil(settings["prefetch_count"] / workers)
+    start_all_listeners(
+        config=config,
+        queues=queues,
+        concurrent=concurrent,
+        max_workers=max_workers,
+        stop_event=stop_event,
+    )
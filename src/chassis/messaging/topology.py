@@ -0,0 +1,33 @@
+from pika import ConnectionParameters
+from typing import (
+    Any,
+    Dict,
+    Set,
+    Tuple,
+)
+import threading
+
+type BrokerKey = Tuple[str, int, str]
+type TopologyItem = Tuple[Any, ...]
+
+# Global Variables ############################################################
+# Queues, exchanges and bindings already declared, per broker
+_DECLARED: Dict[BrokerKey, Set[TopologyItem]] = {}
+_LOCK = threading.Lock()
+
+# Functions ###################################################################
+def broker_key(params: ConnectionParameters) -> BrokerKey:
+    return (params.host, params.port, params.virtual_host)
+
+def is_declared(broker: BrokerKey, item: TopologyItem) -> bool:
+    with _LOCK:
+        return item in _DECLARED.get(broker, ())
+
+def mark_declared(broker: BrokerKey, item: TopologyItem) -> None:
+    with _LOCK:
+        _DECLARED.setdefault(broker, set()).add(item)
+
+def clear_topology_cache() -> None:
+    """Forget every declaration, so the next connects declare again (e.g. after a broker reset)."""
+    with _LOCK:
+        _DECLARED.clear()
@@ -4,6 +4,8 @@ from typing import (
     Awaitable,
     Callable,
     Dict,
+    List,
+    Literal,
     Optional,
     TypedDict,
     Union,
@@ -12,9 +14,26 @@ from typing import (
 type MessageType = Dict[str, Any]
 type _HandlerFunc = Union[
     Callable[[MessageType], None],
-    Callable[[MessageType], Awaitable[None]]
+    Callable[[MessageType], Awaitable[None]],
+    Callable[[List[MessageType]], None],
+    Callable[[List[MessageType]], Awaitable[None]],
 ]
 
+type DeclareMode = Literal["once", "always", "passive", "none"]
+
+class RetryPolicy(TypedDict, total=False):
+    max_attempts: int
+    base_delay: float
+    multiplier: float
+    max_delay: float
+
+class _QueueSettings(TypedDict, total=False):
+    prefetch_count: int
+    batch_size: int
+    max_wait: float
+    requeue_failed: bool
+    retry_policy: RetryPolicy
+
 class RabbitMQConfig(TypedDict):
     host: str
     port: int
@@ -24,4 +43,28 @@ class RabbitMQConfig(TypedDict):
     ca_cert: Optional[Path]
     client_cert: Optional[Path]
     client_key: Optional[Path]
-    prefetch_count: int
\ No newline at end of file
+    prefetch_count: int
+
+class PublishManyResult(TypedDict):
+    published: int
+    acked: int
+    nacked: List[int]
+    returned: List[int]
+    unconfirmed: List[int]
+
+class SpooledMessage(TypedDict):
+    exchange: str
+    routing_key: str
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str]
+    delivery_mode: int
+    message_id: Optional[str]
+    headers: Optional[Dict[str, Any]]
+
+class RabbitMQHealthStatus(TypedDict):
+    healthy: bool
+    blocked: bool
+    checked_at: Optional[float]
+    latency: Optional[float]
+    error: Optional[str]
\ No newline at end of file
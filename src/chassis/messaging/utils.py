@@ -1,99 +1,269 @@
-from .listener import RabbitMQListener
+from .async_listener import AsyncRabbitMQListener
+from .client import build_connection_parameters
+from .dedupe import MessageDeduplicator
+from .health import get_health_monitor
+from .listener import (
+    _await_in_order,
+    RabbitMQListener,
+)
+from .metrics import get_metrics
+from .routing import RoutingTrie
 from .types import (
     _HandlerFunc,
+    _QueueSettings,
     MessageType,
     RabbitMQConfig,
+    RetryPolicy,
 )
-from pika import (
-    BlockingConnection,
-    ConnectionParameters,
-    PlainCredentials,
-    SSLOptions,
-)
+from pika import BlockingConnection
 from typing import (
+    Any,
+    Awaitable,
     Callable,
     Dict,
+    List,
     Optional,
+    Set,
     Tuple,
+    Union,
 )
 import asyncio
 import logging
-import ssl
+import threading
+import time
 
 # Global Variables ############################################################
 logger = logging.getLogger(__name__)
-_QUEUE_HANDLERS: Dict[str, Tuple[_HandlerFunc, Optional[Dict[str, str]]]] = {}
+_QUEUE_HANDLERS: Dict[str, Tuple[_HandlerFunc, Optional[Dict[str, Any]]]] = {}
+# Routing-key pattern -> handlers, per queue; used once a queue has several handlers
+_QUEUE_ROUTES: Dict[str, RoutingTrie[_HandlerFunc]] = {}
+_ROUTED_QUEUES: Set[str] = set()
+_QUEUE_SETTINGS: Dict[str, _QueueSettings] = {}
+_QUEUE_DEDUPLICATORS: Dict[str, MessageDeduplicator] = {}
 
 # Functions ###################################################################
 def register_queue_handler(
     queue: str,
     exchange: Optional[str] = None,
     exchange_type: str = "direct",
-    routing_key: Optional[str] = None,
+    routing_key: Optional[Union[str, List[str]]] = None,
+    prefetch_count: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_wait: float = 0.2,
+    requeue_failed_batches: bool = False,
+    retry_policy: Optional[RetryPolicy] = None,
+    deduplicator: Optional[MessageDeduplicator] = None,
 ) -> Callable[[_HandlerFunc], _HandlerFunc]:
+    """
+    Register a handler of a queue.
+    routing_key may be a list of keys or topic patterns ("*" matches one
+    word, "#" zero or more); the queue is bound with all of them. Several
+    handlers can be registered on one queue, with the same or different
+    patterns: each delivery then goes to every handler whose pattern
+    matches its routing key, and fails if none does.
+    With batch_size, the handler receives a list of up to batch_size
+    messages (collected for at most max_wait seconds) and the batch is acked
+    as a whole; a failing batch is nacked, and requeued only with
+    requeue_failed_batches.
+    With retry_policy, a failed message is retried after a growing delay
+    and parked in "<queue>.dlq" after its last attempt (sync listeners,
+    per-message mode).
+    With deduplicator, deliveries carrying the message id of an already
+    processed message are acked without calling the handler (sync
+    listeners, per-message mode). The deduplicator belongs to the queue,
+    and the latest registration sets (or removes) it.
+    """
     def decorator(func: _HandlerFunc) -> _HandlerFunc:
+        if routing_key is None:
+            patterns = [queue]
+        else:
+            patterns = [routing_key] if isinstance(routing_key, str) else list(routing_key)
+        assert patterns, "'routing_key' must contain at least one key."
+        routes = _QUEUE_ROUTES.setdefault(queue, RoutingTrie())
+        previous = _QUEUE_HANDLERS.get(queue)
+        if previous is not None and previous[1] is not None and previous[1]["exchange"] != exchange:
+            raise ValueError(f"Queue {queue} is already bound to exchange: {previous[1]['exchange']}")
+        for pattern in patterns:
+            routes.add(pattern, func)
+
         exchange_config = None
         if exchange is not None:
             exchange_config = {
                 "exchange": exchange,
                 "exchange_type": exchange_type,
-                "routing_key": routing_key if routing_key is not None else queue,
+                "routing_key": routes.patterns[0],
+                "binding_keys": routes.patterns,
             }
         
         _QUEUE_HANDLERS[queue] = (func, exchange_config)
+        if len({id(handler) for handler in routes.values}) > 1:
+            _ROUTED_QUEUES.add(queue)
+        # Handlers sharing a queue share its settings
+        settings: _QueueSettings = {**_QUEUE_SETTINGS.get(queue, {})}
+        if prefetch_count is not None:
+            settings["prefetch_count"] = prefetch_count
+        if batch_size is not None:
+            assert batch_size > 0, "'batch_size' must be positive."
+            settings["batch_size"] = batch_size
+            settings["max_wait"] = max_wait
+            settings["requeue_failed"] = requeue_failed_batches
+            if queue in _ROUTED_QUEUES:
+                raise ValueError(f"Batch mode supports a single handler per queue: {queue}")
+        if retry_policy is not None:
+            settings["retry_policy"] = retry_policy
+        _QUEUE_SETTINGS[queue] = settings
+        if deduplicator is not None:
+            _QUEUE_DEDUPLICATORS[queue] = deduplicator
+        else:
+            _QUEUE_DEDUPLICATORS.pop(queue, None)
         handler_type = "async" if asyncio.iscoroutinefunction(func) else "sync"
         exchange_info = f" (exchange: {exchange}, type: {exchange_type})" if exchange else " (default exchange)"
         logger.info(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Registered {handler_type} handler for queue: {queue}{exchange_info}")
         return func
     return decorator
 
-def _process_message(message: MessageType, queue: str):
-    """Process incoming RabbitMQ messages."""
-    try:
+def _handlers_for(queue: str, routing_key: Optional[str]) -> Tuple[_HandlerFunc, ...]:
+    """Handlers a delivery goes to: the queue's handler, or the ones matching its routing key."""
+    if queue not in _ROUTED_QUEUES or routing_key is None:
         handler, _ = _QUEUE_HANDLERS[queue]
+        return (handler,)
+    handlers = _QUEUE_ROUTES[queue].match(routing_key)
+    if not handlers:
+        raise ValueError(f"No handler registered for routing key {routing_key} on queue: {queue}")
+    return handlers
+
+def _process_message(
+    message: MessageType, 
+    queue: str,
+    routing_key: Optional[str] = None,
+) -> Optional[Awaitable[None]]:
+    """
+    Process incoming RabbitMQ messages.
+    Async handlers are returned as a coroutine so the listener can run them on
+    its long-lived event loop and ack once they complete.
+    """
+    awaitables: List[Awaitable[None]] = []
+    for handler in _handlers_for(queue, routing_key):
+        pending = _call_handler(handler, message, queue)
+        if pending is not None:
+            awaitables.append(pending)
+    if not awaitables:
+        return None
+    return awaitables[0] if len(awaitables) == 1 else _await_in_order(awaitables)
+
+def _call_handler(
+    handler: _HandlerFunc,
+    message: MessageType,
+    queue: str,
+) -> Optional[Awaitable[None]]:
+    started = time.perf_counter()
+    try:
         if asyncio.iscoroutinefunction(handler):
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(handler(message))
-            except RuntimeError:
-                asyncio.run(handler(message))
-        else:
-            handler(message)
+            return _run_async_handler(handler, message, queue)
+        handler(message)
     except Exception as e:
+        get_metrics().observe_handler(queue, time.perf_counter() - started, False)
         logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Error processing event: Reason={e}", exc_info=True)
         raise
+    get_metrics().observe_handler(queue, time.perf_counter() - started, True)
+    return None
+
+def _process_batch(messages: List[MessageType], queue: str) -> Optional[Awaitable[None]]:
+    """Process a batch of incoming RabbitMQ messages (see _process_message)."""
+    started = time.perf_counter()
+    try:
+        handler, _ = _QUEUE_HANDLERS[queue]
+        if asyncio.iscoroutinefunction(handler):
+            return _run_async_handler(handler, messages, queue)
+        handler(messages)
+    except Exception as e:
+        get_metrics().observe_handler(queue, time.perf_counter() - started, False)
+        logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Error processing batch: Reason={e}", exc_info=True)
+        raise
+    get_metrics().observe_handler(queue, time.perf_counter() - started, True)
+    return None
+
+async def _run_async_handler(
+    handler: _HandlerFunc, 
+    message: Union[MessageType, List[MessageType]],
+    queue: str,
+) -> None:
+    # Failures are logged by the listener once the coroutine completes
+    started = time.perf_counter()
+    try:
+        await handler(message)
+    except Exception:
+        get_metrics().observe_handler(queue, time.perf_counter() - started, False)
+        raise
+    get_metrics().observe_handler(queue, time.perf_counter() - started, True)
+
+def _listener_kwargs(queue: str, config: RabbitMQConfig) -> Dict[str, Any]:
+    """Listener arguments from the registered exchange configuration and settings."""
+    # Get the exchange configuration for this queue
+    if queue not in _QUEUE_HANDLERS:
+        raise ValueError(f"No handler registered for queue: {queue}")
+    
+    _, exchange_config = _QUEUE_HANDLERS[queue]
+    settings = _QUEUE_SETTINGS.get(queue, {})
+    if "prefetch_count" in settings:
+        config = {**config, "prefetch_count": settings["prefetch_count"]}
+    if "batch_size" in settings and config["prefetch_count"] < settings["batch_size"]:
+        # A batch can only fill up if the broker lets that many deliveries in
+        config = {**config, "prefetch_count": settings["batch_size"]}
+    
+    # Create listener with appropriate exchange configuration
+    listener_kwargs: Dict[str, Any] = {
+        "logger": logger,
+        "queue": queue,
+        "rabbitmq_config": config,
+    }
+    
+    if exchange_config:
+        listener_kwargs.update(exchange_config)
+    return listener_kwargs
+
+def _consume_kwargs(queue: str) -> Dict[str, Any]:
+    """Consumer callback (and batch arguments) for the registered settings."""
+    settings = _QUEUE_SETTINGS.get(queue, {})
+    if "batch_size" not in settings:
+        return {
+            "callback": _process_message,
+            "with_routing_key": queue in _ROUTED_QUEUES,
+        }
+    return {
+        "callback": _process_batch,
+        "batch_size": settings["batch_size"],
+        "max_wait": settings.get("max_wait", 0.2),
+        "requeue_failed": settings.get("requeue_failed", False),
+    }
 
 def start_rabbitmq_listener(
     queue: str,
     config: RabbitMQConfig,
     one_use: bool = False,
+    concurrent: bool = False,
+    max_workers: Optional[int] = None,
+    ordered_by_routing_key: bool = False,
 ) -> None:
     """
     Start RabbitMQ listener in a separate thread.
     Uses exchange configuration from the registered handler decorator.
+    With concurrent=True, handlers run in a thread pool sized to the
+    prefetch count (or max_workers).
     """
     try:
-        # Get the exchange configuration for this queue
-        if queue not in _QUEUE_HANDLERS:
-            raise ValueError(f"No handler registered for queue: {queue}")
-        
-        _, exchange_config = _QUEUE_HANDLERS[queue]
-        
-        # Create listener with appropriate exchange configuration
-        listener_kwargs = {
-            "logger": logger,
-            "queue": queue,
-            "rabbitmq_config": config,
-        }
-        
-        if exchange_config:
-            listener_kwargs.update(exchange_config)
-        
-        with RabbitMQListener(**listener_kwargs) as listener:
+        with RabbitMQListener(
+            **_listener_kwargs(queue, config),
+            retry_policy=_QUEUE_SETTINGS.get(queue, {}).get("retry_policy"),
+            deduplicator=_QUEUE_DEDUPLICATORS.get(queue),
+        ) as listener:
             logger.info(f"[LOG:CHASSIS:RABBITMQ_UTILS] - RabbitMQ listener connected to queue: {queue}")
             listener.consume(
-                callback=_process_message, 
-                one_use=one_use
+                **_consume_kwargs(queue),
+                one_use=one_use,
+                concurrent=concurrent,
+                max_workers=max_workers,
+                ordered_by_routing_key=ordered_by_routing_key,
             )
     except KeyboardInterrupt:
         logger.info("[LOG:CHASSIS:RABBITMQ_UTILS] - RabbitMQ listener stopped by keyboard interrupt")
@@ -103,56 +273,172 @@ def start_rabbitmq_listener(
         # Delete if queue is one use
         if one_use:
             del _QUEUE_HANDLERS[queue]
+            _QUEUE_ROUTES.pop(queue, None)
+            _ROUTED_QUEUES.discard(queue)
 
-def is_rabbitmq_healthy(rabbitmq_config: RabbitMQConfig) -> bool:
+def start_all_listeners(
+    config: RabbitMQConfig,
+    queues: Optional[List[str]] = None,
+    concurrent: bool = False,
+    max_workers: Optional[int] = None,
+    ordered_by_routing_key: bool = False,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """
+    Consume every registered queue (or the given ones) over one connection.
+    Each queue gets its own channel, so prefetch stays per queue.
+    Blocks until interrupted or every consumer is cancelled.
+    Setting stop_event (e.g. from a signal handler) drains gracefully: the
+    consumers are cancelled from the connection thread, running handlers
+    finish and their deliveries are settled before this returns.
+    """
+    queues = list(_QUEUE_HANDLERS) if queues is None else queues
+    connection: Optional[BlockingConnection] = None
+    listeners: List[RabbitMQListener] = []
+    finishers: List[Callable[[], None]] = []
+    done = threading.Event()
     try:
-        # Create credentials
-        credentials = PlainCredentials(rabbitmq_config["username"], rabbitmq_config["password"])
-        
-        # Configure TLS if enabled
-        if rabbitmq_config["use_tls"]:
-            ssl_context = ssl.create_default_context(
-                purpose=ssl.Purpose.SERVER_AUTH,
-                cafile=str(rabbitmq_config["ca_cert"]) if rabbitmq_config["ca_cert"] else None
+        connection = BlockingConnection(build_connection_parameters(config))
+        for queue in queues:
+            listener = RabbitMQListener(
+                **_listener_kwargs(queue, config),
+                retry_policy=_QUEUE_SETTINGS.get(queue, {}).get("retry_policy"),
+                deduplicator=_QUEUE_DEDUPLICATORS.get(queue),
             )
-            
-            # Load client certificate if provided
-            if rabbitmq_config["client_cert"] and rabbitmq_config["client_key"]:
-                ssl_context.load_cert_chain(
-                    certfile=str(rabbitmq_config["client_cert"]),
-                    keyfile=str(rabbitmq_config["client_key"])
-                )
-            
-            # For development, you might want to disable hostname checking
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            ssl_options = SSLOptions(ssl_context, rabbitmq_config["host"])
+            listener._connect(connection)
+            listeners.append(listener)
+            finishers.append(listener.start_consuming(
+                **_consume_kwargs(queue),
+                concurrent=concurrent,
+                max_workers=max_workers,
+                ordered_by_routing_key=ordered_by_routing_key,
+            ))
+        logger.info(f"[LOG:CHASSIS:RABBITMQ_UTILS] - RabbitMQ listener connected to queues: {', '.join(queues)}")
+
+        if stop_event is not None:
+            threading.Thread(
+                target=_stop_when_set,
+                args=(stop_event, done, connection, listeners),
+                name="chassis-listeners-stop",
+                daemon=True,
+            ).start()
+        while connection.is_open and any(listener.is_consuming for listener in listeners):
+            connection.process_data_events(time_limit=None)
+    except KeyboardInterrupt:
+        logger.info("[LOG:CHASSIS:RABBITMQ_UTILS] - RabbitMQ listeners stopped by keyboard interrupt")
+    except Exception as e:
+        logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - RabbitMQ listeners error: Reason={e}", exc_info=True)
+    finally:
+        done.set()
+        for finish in finishers:
+            try:
+                finish()
+            except Exception as e:
+                logger.warning(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Error stopping listener: Reason={e}")
+        if connection is not None and connection.is_open:
+            connection.close()
+
+def _stop_when_set(
+    stop_event: threading.Event,
+    done: threading.Event,
+    connection: BlockingConnection,
+    listeners: List[RabbitMQListener],
+) -> None:
+    """Cancel the consumers from the connection thread once stop_event is set."""
+    def _stop_consuming() -> None:
+        logger.info("[LOG:CHASSIS:RABBITMQ_UTILS] - Stop requested, draining listeners")
+        for listener in listeners:
+            if listener.is_consuming:
+                assert listener._channel is not None, "A consuming listener has a channel"
+                listener._channel.stop_consuming()
+
+    while not done.is_set():
+        if stop_event.wait(0.5):
+            try:
+                connection.add_callback_threadsafe(_stop_consuming)
+            except Exception:
+                # Connection closed meanwhile: nothing left to stop
+                pass
+            return
+
+async def _process_message_async(
+    message: MessageType, 
+    queue: str,
+    routing_key: Optional[str] = None,
+) -> None:
+    """Process incoming RabbitMQ messages on the running event loop."""
+    try:
+        for handler in _handlers_for(queue, routing_key):
+            if asyncio.iscoroutinefunction(handler):
+                await handler(message)
+            else:
+                # Keep the event loop free while sync handlers run
+                await asyncio.to_thread(handler, message)
+    except Exception as e:
+        logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Error processing event: Reason={e}", exc_info=True)
+        raise
+
+async def _process_batch_async(messages: List[MessageType], queue: str) -> None:
+    """Process a batch of incoming RabbitMQ messages on the running event loop."""
+    try:
+        handler, _ = _QUEUE_HANDLERS[queue]
+        if asyncio.iscoroutinefunction(handler):
+            await handler(messages)
         else:
-            ssl_options = None
-        
-        # Create connection parameters
-        params = ConnectionParameters(
-            host=rabbitmq_config["host"],
-            port=rabbitmq_config["port"],
-            credentials=credentials,
-            ssl_options=ssl_options,
-            heartbeat=600,
-            blocked_connection_timeout=300,
-        )
-
-        connection = BlockingConnection(params)
-        channel = connection.channel()
-
-        channel.queue_declare(
-            queue="", 
-            exclusive=True,
-            auto_delete=True,
-        )
-
-        channel.close()
-        connection.close()
-        return True
+            await asyncio.to_thread(handler, messages)
+    except Exception as e:
+        logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Error processing batch: Reason={e}", exc_info=True)
+        raise
 
-    except Exception:
-        return False
\ No newline at end of file
+async def start_async_rabbitmq_listener(
+    queue: str,
+    config: RabbitMQConfig,
+    one_use: bool = False,
+) -> None:
+    """
+    Start RabbitMQ listener as a task on the running event loop.
+    Uses exchange configuration from the registered handler decorator.
+    """
+    try:
+        async with AsyncRabbitMQListener(**_listener_kwargs(queue, config)) as listener:
+            logger.info(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Async RabbitMQ listener connected to queue: {queue}")
+            settings = _QUEUE_SETTINGS.get(queue, {})
+            if "batch_size" in settings:
+                await listener.consume_batches(
+                    callback=_process_batch_async,
+                    batch_size=settings["batch_size"],
+                    max_wait=settings.get("max_wait", 0.2),
+                    requeue_failed=settings.get("requeue_failed", False),
+                    one_use=one_use,
+                )
+            else:
+                await listener.consume(
+                    callback=_process_message_async,
+                    one_use=one_use,
+                    with_routing_key=queue in _ROUTED_QUEUES,
+                )
+    except asyncio.CancelledError:
+        logger.info("[LOG:CHASSIS:RABBITMQ_UTILS] - Async RabbitMQ listener cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"[LOG:CHASSIS:RABBITMQ_UTILS] - Async RabbitMQ listener error: Reason={e}", exc_info=True)
+    finally:
+        if one_use:
+            _QUEUE_HANDLERS.pop(queue, None)
+            _QUEUE_ROUTES.pop(queue, None)
+            _ROUTED_QUEUES.discard(queue)
+
+def is_rabbitmq_healthy(
+    rabbitmq_config: RabbitMQConfig,
+    interval: float = 10.0,
+    first_probe_timeout: float = 5.0,
+) -> bool:
+    """
+    Whether RabbitMQ answered the last background probe (see
+    RabbitMQHealthMonitor). The first call starts the monitor and waits up
+    to first_probe_timeout for its first result; later calls only read
+    the cached result.
+    """
+    monitor = get_health_monitor(rabbitmq_config, interval)
+    monitor.wait_for_first_probe(first_probe_timeout)
+    return monitor.is_healthy()
@@ -1,4 +1,5 @@
 from .utils import (
+    get_messaging_metrics,
     get_system_metrics,
     raise_and_log_error
 )
@@ -8,6 +9,7 @@ from typing import (
 )
 
 __all__: List[LiteralString] = [
+    "get_messaging_metrics",
     "get_system_metrics",
     "raise_and_log_error",
 ]
\ No newline at end of file
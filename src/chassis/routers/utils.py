@@ -1,3 +1,4 @@
+from ..messaging import get_metrics
 from fastapi import HTTPException
 import psutil
 import logging
@@ -25,6 +26,10 @@ def get_system_metrics() -> dict:
 
     return metrics
 
+def get_messaging_metrics() -> dict:
+    """Messaging counters and latency histograms, plus spool, pool and relay stats."""
+    return get_metrics().snapshot()
+
 def raise_and_log_error(
     logger: logging.Logger,
     status_code: int,
@@ -1,3 +1,10 @@
+from .cache import (
+    EntityCache,
+    clear_entity_caches,
+    disable_entity_cache,
+    enable_entity_cache,
+    get_entity_cache_stats,
+)
 from .database import (
     Base, 
     Engine,
@@ -6,12 +13,20 @@ from .database import (
 from .dependency import get_db
 from .model import BaseModel
 from .utils import (
+    bulk_insert,
+    bulk_update_by_ids,
+    bulk_upsert,
+    delete_by_ids,
     delete_element_by_id,
     get_element_by_id,
     get_element_statement_result,
+    get_keyset_page,
     get_list,
     get_list_statement_result,
+    stream_list,
+    stream_list_statement_result,
 )
+from .types import KeysetPage
 from typing import (
     List,
     LiteralString,
@@ -20,12 +35,25 @@ from typing import (
 __all__: List[LiteralString] = [
     "Base",
     "BaseModel",
+    "bulk_insert",
+    "bulk_update_by_ids",
+    "bulk_upsert",
+    "clear_entity_caches",
+    "delete_by_ids",
     "delete_element_by_id",
+    "disable_entity_cache",
+    "enable_entity_cache",
     "Engine",
+    "EntityCache",
     "get_db",
     "get_element_by_id",
     "get_element_statement_result",
+    "get_entity_cache_stats",
+    "get_keyset_page",
     "get_list",
     "get_list_statement_result",
+    "KeysetPage",
     "SessionLocal",
+    "stream_list",
+    "stream_list_statement_result",
 ]
\ No newline at end of file
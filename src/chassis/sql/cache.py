@@ -0,0 +1,206 @@
+from collections import OrderedDict
+from sqlalchemy import (
+    event,
+    inspect,
+)
+from sqlalchemy.orm import (
+    Session,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+import threading
+import time
+
+T = TypeVar("T")
+
+class EntityCache:
+    """
+    LRU cache of the column values of one model's rows, by primary key.
+
+    Entries expire ttl seconds after they were stored, and the least recently
+    used entries are dropped beyond max_size. Values are cached rather than
+    instances, so a hit builds a fresh instance for the requesting session.
+    """
+    def __init__(
+        self,
+        model: Type[Any],
+        max_size: int = 1024,
+        ttl: float = 300.0,
+    ) -> None:
+        assert max_size > 0, "'max_size' must be positive."
+        self._model = model
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[Any, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def get(self, element_id: Any) -> Optional[T]:
+        """A detached instance built from the cached values (counts a hit or a miss)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(element_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[element_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(element_id)
+            self._hits += 1
+            values = entry[1]
+        instance = inspect(self._model).class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        return instance
+
+    def put(self, element_id: Any, element: Any) -> None:
+        """Store the loaded column values of element."""
+        loaded = inspect(element).dict
+        values = {
+            attribute.key: loaded[attribute.key]
+            for attribute in inspect(self._model).column_attrs
+            if attribute.key in loaded
+        }
+        with self._lock:
+            self._entries[element_id] = (time.monotonic() + self._ttl, values)
+            self._entries.move_to_end(element_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, element_ids: Iterable[Any]) -> None:
+        with self._lock:
+            for element_id in element_ids:
+                if self._entries.pop(element_id, None) is not None:
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+# Global Variables ############################################################
+_CACHES: Dict[Type[Any], EntityCache] = {}
+# Session.info key of the cached rows changed in the session's transaction
+_PENDING_KEY = "chassis_entity_cache_pending"
+# Pending key standing for every row of a model
+_ALL_ROWS: Any = object()
+# Relationship loading strategies that run when the row itself is loaded
+_EAGER_STRATEGIES = frozenset({"joined", "selectin", "subquery", "immediate"})
+
+# Functions ###################################################################
+def enable_entity_cache(
+    model: Type[Any],
+    max_size: int = 1024,
+    ttl: float = 300.0,
+) -> EntityCache:
+    """
+    Cache the rows of model read through get_element_by_id.
+    Rows updated or deleted through ORM sessions (flush) or the chassis.sql
+    helpers are invalidated; changes made by other processes are only seen
+    once the entry expires after ttl seconds.
+    Only column values are cached, so models with eagerly loaded
+    relationships are rejected: a hit could not provide them.
+    """
+    eager = [
+        relationship.key for relationship in inspect(model).relationships
+        # lazy=False is the legacy spelling of "joined"
+        if relationship.lazy is False or relationship.lazy in _EAGER_STRATEGIES
+    ]
+    if eager:
+        raise ValueError(f"Cannot cache {model.__name__}: eagerly loaded relationships {eager}")
+    cache = _CACHES[model] = EntityCache(model, max_size, ttl)
+    return cache
+
+def disable_entity_cache(model: Type[Any]) -> None:
+    _CACHES.pop(model, None)
+
+def get_entity_cache(model: Type[Any]) -> Optional[EntityCache]:
+    return _CACHES.get(model)
+
+def get_entity_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every enabled cache, by model name."""
+    return {model.__name__: cache.stats for model, cache in _CACHES.items()}
+
+def clear_entity_caches() -> None:
+    """Empty every enabled cache (the caches stay enabled)."""
+    for cache in list(_CACHES.values()):
+        cache.clear()
+
+def invalidate_entities(
+    model: Type[Any],
+    element_ids: Optional[Iterable[Any]] = None,
+    session: Optional[Session] = None,
+) -> None:
+    """
+    Drop the given rows of model from its cache (every row if element_ids
+    is None). With session, they are dropped again when its transaction
+    commits, as a reader may cache the old rows until then.
+    """
+    cache = _CACHES.get(model)
+    if cache is None:
+        return
+    keys = None if element_ids is None else list(element_ids)
+    if keys is None:
+        cache.clear()
+    else:
+        cache.invalidate(keys)
+    if session is not None:
+        pending: Set[Tuple[Type[Any], Any]] = session.info.setdefault(_PENDING_KEY, set())
+        if keys is None:
+            pending.add((model, _ALL_ROWS))
+        else:
+            pending.update((model, key) for key in keys)
+
+def _cache_key(identity: Tuple[Any, ...]) -> Any:
+    return identity[0] if len(identity) == 1 else identity
+
+@event.listens_for(Session, "after_flush")
+def _on_after_flush(session: Session, flush_context: Any) -> None:
+    if not _CACHES:
+        return
+    pending: Set[Tuple[Type[Any], Any]] = session.info.setdefault(_PENDING_KEY, set())
+    for element in list(session.dirty) + list(session.deleted):
+        model = type(element)
+        identity = inspect(element).identity
+        if model in _CACHES and identity is not None:
+            key = _cache_key(identity)
+            _CACHES[model].invalidate([key])
+            pending.add((model, key))
+
+@event.listens_for(Session, "after_commit")
+def _on_after_commit(session: Session) -> None:
+    # Again after commit: another session may have cached the old row in between
+    for model, key in session.info.pop(_PENDING_KEY, ()):
+        invalidate_entities(model, None if key is _ALL_ROWS else [key])
+
+@event.listens_for(Session, "after_soft_rollback")
+def _on_after_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
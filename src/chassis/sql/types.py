@@ -0,0 +1,14 @@
+from typing import (
+    Generic,
+    List,
+    Optional,
+    TypedDict,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+class KeysetPage(TypedDict, Generic[T]):
+    items: List[T]
+    # Opaque cursor of the next page; None on the last page
+    next_cursor: Optional[str]
\ No newline at end of file
@@ -1,16 +1,54 @@
-from sqlalchemy import Select
+from .cache import (
+    get_entity_cache,
+    invalidate_entities,
+)
+from .types import KeysetPage
+from datetime import (
+    date,
+    datetime,
+    time,
+)
+from decimal import Decimal
+from sqlalchemy import (
+    Column,
+    Select,
+    Table,
+    delete,
+    insert,
+    inspect,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import (
+    postgresql,
+    sqlite,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.future import select
 from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type, 
     TypeVar
 )
+import base64
+import json
+import uuid
 
 T = TypeVar("T")
 
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 async def get_list(db: AsyncSession, model: Type[T]) -> List[T]:
     """Retrieve a list of elements from database."""
     result = await db.execute(select(model))
@@ -24,6 +62,103 @@ async def get_list_statement_result(
     result = await db.execute(stmt)
     return list(result.unique().scalars().all())
 
+async def stream_list(
+    db: AsyncSession,
+    model: Type[T],
+    yield_per: int = 1000,
+) -> AsyncGenerator[T, None]:
+    """Yield every element of a table, fetching yield_per rows at a time."""
+    async for item in stream_list_statement_result(db, select(model), yield_per):
+        yield item
+
+async def stream_list_statement_result(
+    db: AsyncSession,
+    stmt: Select[Tuple[T]],
+    yield_per: int = 1000,
+) -> AsyncGenerator[T, None]:
+    """
+    Execute given statement on a server-side cursor and yield its items,
+    keeping at most yield_per rows in memory. Rows are not deduplicated, so
+    collections must not be joined-eager-loaded (use selectinload).
+    """
+    result = await db.stream(stmt.execution_options(yield_per=yield_per))
+    try:
+        async for item in result.scalars():
+            yield item
+    finally:
+        await result.close()
+
+async def get_keyset_page(
+    db: AsyncSession,
+    model: Type[T],
+    order_by: Sequence[str],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    stmt: Optional[Select[Tuple[T]]] = None,
+) -> KeysetPage[T]:
+    """
+    Return one page of elements ordered by the given attributes, starting
+    after cursor (the next_cursor of the previous page).
+
+    Pages are found with a WHERE (columns) > (last values) seek instead of
+    OFFSET, so every page costs the same with an index on the ordering
+    columns. The primary key is appended to the ordering to make it unique;
+    ordering columns must not be NULL. stmt can add filters to the query.
+    """
+    assert limit > 0, "'limit' must be positive."
+    mapper = inspect(model)
+    names = list(order_by)
+    for column in mapper.primary_key:
+        name = mapper.get_property_by_column(column).key
+        if name not in names:
+            names.append(name)
+    attributes = [getattr(model, name) for name in names]
+
+    stmt = stmt if stmt is not None else select(model)
+    if cursor is not None:
+        values = _decode_cursor(cursor, attributes)
+        keys, last = tuple_(*attributes), tuple_(*values)
+        stmt = stmt.where(keys < last if descending else keys > last)
+    stmt = stmt.order_by(*[a.desc() if descending else a.asc() for a in attributes]).limit(limit + 1)
+
+    items = list((await db.execute(stmt)).unique().scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor([getattr(items[-1], name) for name in names])
+    return {"items": items, "next_cursor": next_cursor}
+
+def _encode_cursor(values: List[Any]) -> str:
+    data = json.dumps([
+        value.isoformat() if isinstance(value, (date, datetime, time)) 
+        else str(value) if isinstance(value, (Decimal, uuid.UUID)) 
+        else value 
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+def _decode_cursor(cursor: str, attributes: List[Any]) -> List[Any]:
+    """Cursor values converted back to the Python types of their columns."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != len(attributes):
+        raise ValueError("Invalid pagination cursor")
+    decoded: List[Any] = []
+    for value, attribute in zip(values, attributes):
+        try:
+            python_type = attribute.type.python_type
+        except NotImplementedError:
+            python_type = None
+        if isinstance(value, str) and python_type in (date, datetime, time):
+            value = python_type.fromisoformat(value)
+        elif isinstance(value, str) and python_type in (Decimal, uuid.UUID):
+            value = python_type(value)
+        decoded.append(value)
+    return decoded
+
 async def get_element_statement_result(
     db: AsyncSession, 
     stmt: Select[Tuple[T]],
@@ -37,8 +172,25 @@ async def get_element_by_id(
     model: Type[T], 
     element_id: int
 ) -> Optional[T]:
-    """Retrieve any DB element by id."""
-    return await db.get(model, element_id)
+    """
+    Retrieve any DB element by id.
+    With enable_entity_cache(model), rows are read through the entity cache.
+    """
+    cache = get_entity_cache(model)
+    if cache is None:
+        return await db.get(model, element_id)
+    # The session's own copy (possibly modified) wins over the cache
+    element = db.identity_map.get(identity_key(model, element_id))
+    if element is not None:
+        return element
+    cached = cache.get(element_id)
+    if cached is not None:
+        # Attach without a SELECT
+        return await db.merge(cached, load=False)
+    element = await db.get(model, element_id)
+    if element is not None:
+        cache.put(element_id, element)
+    return element
 
 async def delete_element_by_id(
     db: AsyncSession, 
@@ -51,3 +203,127 @@ async def delete_element_by_id(
         await db.delete(element)
         await db.commit()
         await db.flush()
+    invalidate_entities(model, [element_id])
+
+def _table(model: Type[Any]) -> Table:
+    return model.__table__
+
+def _primary_key(model: Type[Any]) -> Column[Any]:
+    columns = list(_table(model).primary_key.columns)
+    assert len(columns) == 1, "Only single-column primary keys are supported."
+    return columns[0]
+
+def _chunks(items: Sequence[Any], chunk_size: int) -> List[Sequence[Any]]:
+    assert chunk_size > 0, "'chunk_size' must be positive."
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+async def bulk_insert(
+    db: AsyncSession,
+    model: Type[T],
+    rows: Sequence[Dict[str, Any]],
+    chunk_size: int = 1000,
+    commit: bool = True,
+) -> int:
+    """
+    Insert rows (dicts keyed by column name) with one executemany per chunk.
+    No ORM objects are created. Returns the number of rows inserted.
+    """
+    for chunk in _chunks(rows, chunk_size):
+        await db.execute(insert(_table(model)), list(chunk))
+    if commit:
+        await db.commit()
+    return len(rows)
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Type[T],
+    rows: Sequence[Dict[str, Any]],
+    index_elements: Optional[Sequence[str]] = None,
+    update_columns: Optional[Sequence[str]] = None,
+    chunk_size: int = 1000,
+    commit: bool = True,
+) -> int:
+    """
+    Insert rows, updating the existing ones (INSERT ... ON CONFLICT DO UPDATE).
+
+    Conflicts are detected on index_elements (the primary key by default,
+    or the columns of a unique constraint). update_columns defaults to
+    every other column present in the rows; with no columns to update,
+    conflicting rows are skipped. Supported on PostgreSQL and SQLite.
+    Returns the number of rows sent.
+    """
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect not in _UPSERT_INSERTS:
+        raise NotImplementedError(f"Upsert is not supported for dialect: {dialect}")
+    table = _table(model)
+    keys = list(index_elements) if index_elements is not None else [c.name for c in table.primary_key.columns]
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name not in keys]
+
+    stmt = _UPSERT_INSERTS[dialect](table)
+    if update_columns:
+        set_: Dict[str, Any] = {name: stmt.excluded[name] for name in update_columns}
+        # ON CONFLICT updates do not apply column onupdate defaults by themselves
+        for column in table.columns:
+            if column.onupdate is not None and column.onupdate.is_clause_element and column.name not in set_:
+                set_[column.name] = column.onupdate.arg
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+
+    for chunk in _chunks(rows, chunk_size):
+        await db.execute(stmt, list(chunk))
+    invalidate_entities(model, session=db.sync_session)
+    if commit:
+        await db.commit()
+    return len(rows)
+
+async def bulk_update_by_ids(
+    db: AsyncSession,
+    model: Type[T],
+    element_ids: Sequence[Any],
+    values: Dict[str, Any],
+    chunk_size: int = 1000,
+    commit: bool = True,
+) -> int:
+    """
+    Set the same column values on every row whose id is in element_ids,
+    with one UPDATE ... WHERE id IN (...) per chunk of ids.
+    Objects already loaded in the session are not refreshed.
+    Returns the number of rows updated.
+    """
+    primary_key = _primary_key(model)
+    updated = 0
+    for chunk in _chunks(element_ids, chunk_size):
+        result = await db.execute(
+            update(_table(model)).where(primary_key.in_(chunk)).values(**values)
+        )
+        updated += result.rowcount
+    invalidate_entities(model, element_ids, db.sync_session)
+    if commit:
+        await db.commit()
+    return updated
+
+async def delete_by_ids(
+    db: AsyncSession,
+    model: Type[T],
+    element_ids: Sequence[Any],
+    chunk_size: int = 1000,
+    commit: bool = True,
+) -> int:
+    """
+    Delete every row whose id is in element_ids, with one
+    DELETE ... WHERE id IN (...) per chunk of ids (no SELECT first, and no
+    ORM cascades). Returns the number of rows deleted.
+    """
+    primary_key = _primary_key(model)
+    deleted = 0
+    for chunk in _chunks(element_ids, chunk_size):
+        result = await db.execute(delete(_table(model)).where(primary_key.in_(chunk)))
+        deleted += result.rowcount
+    invalidate_entities(model, element_ids, db.sync_session)
+    if commit:
+        await db.commit()
+    return deleted